@@ -0,0 +1,929 @@
+﻿import os
+import concurrent.futures
+import importlib.util
+from dataclasses import dataclass
+import numpy as np
+
+HAS_TIFFFILE = importlib.util.find_spec('tifffile') is not None
+HAS_SCIPY = importlib.util.find_spec('scipy') is not None
+
+@dataclass(frozen=True)
+class ConversionProfile:
+    white: np.ndarray
+    rgb_to_xyz_t: np.ndarray
+    xyz_to_rgb_t: np.ndarray
+    rgb_to_lab_t: np.ndarray
+    lab_to_rgb_t: np.ndarray
+
+class ColorConverter:
+    
+    Xw, Yw, Zw = 95.047, 100.0, 108.883
+    WHITE = np.array([Xw, Yw, Zw])
+    
+    RGB_TO_XYZ = np.array([
+        [0.412453, 0.357580, 0.180423],
+        [0.212671, 0.715160, 0.072169],
+        [0.019334, 0.119193, 0.950227]
+    ])
+    
+    XYZ_TO_RGB = np.array([
+        [3.2406, -1.5372, -0.4986],
+        [-0.9689, 1.8758, 0.0415],
+        [0.0557, -0.2040, 1.0570]
+    ])
+    
+    ILLUMINANTS = {
+        'D65': (Xw, Yw, Zw),
+        'D50': (96.422, 100.0, 82.521),
+        'A': (109.850, 100.0, 35.585),
+    }
+    
+    BRADFORD = np.array([
+        [0.8951, 0.2664, -0.1614],
+        [-0.7502, 1.7135, 0.0367],
+        [0.0389, -0.0685, 1.0296]
+    ])
+    
+    _profiles = {}
+    
+    CHUNK_SIZE = 1 << 14
+    
+    @staticmethod
+    def _prepare_out(values, out, dtype=None):
+        values = np.asarray(values)
+        if values.shape[-1:] != (3,):
+            raise ValueError(f"Expected an array of shape (..., 3), got {values.shape}")
+        
+        if out is None:
+            out = np.empty(values.shape, dtype=dtype or np.float64)
+        elif out.shape != values.shape:
+            raise ValueError(f"Output shape {out.shape} does not match input shape {values.shape}")
+        
+        if out.dtype not in (np.float32, np.float64):
+            raise ValueError(f"Output dtype must be float32 or float64, got {out.dtype}")
+        
+        return values, out
+    
+    @staticmethod
+    def _cast(array, out):
+        return array.astype(out.dtype, copy=False)
+    
+    @staticmethod
+    def resolve_white(white=None):
+        if white is None:
+            white = 'D65'
+        
+        if isinstance(white, str):
+            try:
+                white = ColorConverter.ILLUMINANTS[white.upper()]
+            except KeyError:
+                raise ValueError(f"Unknown illuminant '{white}', expected one of "
+                                 f"{sorted(ColorConverter.ILLUMINANTS)} or an (X, Y, Z) triple")
+        
+        white = tuple(float(c) for c in white)
+        if len(white) != 3:
+            raise ValueError(f"White point must have three components, got {white}")
+        return white
+    
+    @staticmethod
+    def adaptation_matrix(source_white, target_white):
+        bradford = ColorConverter.BRADFORD
+        source = bradford @ np.array(ColorConverter.resolve_white(source_white))
+        target = bradford @ np.array(ColorConverter.resolve_white(target_white))
+        return np.linalg.inv(bradford) @ np.diag(target / source) @ bradford
+    
+    @staticmethod
+    def _build_profile(white, dtype):
+        rgb_to_xyz = ColorConverter.RGB_TO_XYZ * 100
+        xyz_to_rgb = ColorConverter.XYZ_TO_RGB / 100
+        
+        native = ColorConverter.ILLUMINANTS['D65']
+        if white != native:
+            rgb_to_xyz = ColorConverter.adaptation_matrix(native, white) @ rgb_to_xyz
+            xyz_to_rgb = xyz_to_rgb @ ColorConverter.adaptation_matrix(white, native)
+        
+        white = np.array(white)
+        matrices = {
+            'white': white,
+            'rgb_to_xyz_t': rgb_to_xyz.T,
+            'xyz_to_rgb_t': xyz_to_rgb.T,
+            'rgb_to_lab_t': (rgb_to_xyz / white[:, None]).T,
+            'lab_to_rgb_t': (xyz_to_rgb * white).T,
+        }
+        for name, matrix in matrices.items():
+            matrix = np.ascontiguousarray(matrix, dtype=dtype)
+            matrix.setflags(write=False)
+            matrices[name] = matrix
+        
+        return ConversionProfile(**matrices)
+    
+    @staticmethod
+    def profile(white=None, dtype=np.float64):
+        key = (ColorConverter.resolve_white(white), np.dtype(dtype))
+        profile = ColorConverter._profiles.get(key)
+        if profile is None:
+            profile = ColorConverter._build_profile(*key)
+            ColorConverter._profiles[key] = profile
+        return profile
+    
+    @staticmethod
+    def _chunks(values, out, chunk_size):
+        if not out.flags.c_contiguous:
+            raise ValueError("Output buffer must be C-contiguous")
+        
+        flat_values = values.reshape(-1, 3)
+        flat_out = out.reshape(-1, 3)
+        for start in range(0, len(flat_values), chunk_size):
+            stop = start + chunk_size
+            yield flat_values[start:stop], flat_out[start:stop]
+    
+    @staticmethod
+    def _srgb_linearize(c):
+        high = c > 0.04045
+        np.add(c, 0.055, out=c, where=high)
+        np.divide(c, 1.055, out=c, where=high)
+        np.power(c, 2.4, out=c, where=high)
+        np.divide(c, 12.92, out=c, where=~high)
+    
+    @staticmethod
+    def _srgb_compand(c):
+        high = c > 0.0031308
+        np.power(c, 1/2.4, out=c, where=high)
+        np.multiply(c, 1.055, out=c, where=high)
+        np.subtract(c, 0.055, out=c, where=high)
+        np.multiply(c, 12.92, out=c, where=~high)
+    
+    @staticmethod
+    def _lab_f(t):
+        high = t > 0.008856
+        np.cbrt(t, out=t, where=high)
+        np.multiply(t, 7.787, out=t, where=~high)
+        np.add(t, 16/116, out=t, where=~high)
+    
+    @staticmethod
+    def _lab_f_inv(t):
+        high = t > 0.008856 ** (1/3)
+        np.power(t, 3, out=t, where=high)
+        np.subtract(t, 16/116, out=t, where=~high)
+        np.divide(t, 7.787, out=t, where=~high)
+    
+    @staticmethod
+    def _lab_from_f(f):
+        fy = f[..., 1].copy()
+        np.subtract(f[..., 0], fy, out=f[..., 1])
+        f[..., 1] *= 500
+        np.subtract(fy, f[..., 2], out=f[..., 2])
+        f[..., 2] *= 200
+        np.multiply(fy, 116, out=f[..., 0])
+        f[..., 0] -= 16
+    
+    @staticmethod
+    def _f_from_lab(lab, out):
+        fy = np.add(lab[..., 0], 16, dtype=out.dtype)
+        fy /= 116
+        np.divide(lab[..., 1], 500, out=out[..., 0])
+        out[..., 0] += fy
+        np.divide(lab[..., 2], -200, out=out[..., 2])
+        out[..., 2] += fy
+        out[..., 1] = fy
+    
+    @staticmethod
+    def _is_8bit(values):
+        if values.dtype == np.uint8:
+            return True
+        if values.dtype.kind not in 'iu' or values.size == 0:
+            return False
+        return values.min() >= 0 and values.max() <= 255
+    
+    @staticmethod
+    def rgb_to_xyz_batch(rgb, out=None, white=None, dtype=None):
+        rgb, out = ColorConverter._prepare_out(rgb, out, dtype)
+        
+        if ColorConverter._is_8bit(rgb):
+            np.take(ColorConverter._cast(SRGB_TO_LINEAR, out), rgb, out=out)
+        else:
+            np.divide(rgb, 255.0, out=out)
+            ColorConverter._srgb_linearize(out)
+        np.matmul(out, ColorConverter.profile(white, out.dtype).rgb_to_xyz_t, out=out)
+        return out
+    
+    @staticmethod
+    def xyz_to_rgb_batch(xyz, out=None, clip=True, white=None, dtype=None, gamut=None):
+        xyz, out = ColorConverter._prepare_out(xyz, out, dtype)
+        
+        if gamut is not None:
+            if not clip:
+                raise ValueError("clip=False cannot be combined with gamut mapping, which always yields in-gamut RGB")
+            ColorConverter.xyz_to_lab_batch(xyz, out=out, white=white)
+            return ColorConverter.lab_to_rgb_batch(out, out=out, white=white, gamut=gamut)
+        
+        np.matmul(xyz, ColorConverter.profile(white, out.dtype).xyz_to_rgb_t, out=out)
+        ColorConverter._srgb_compand(out)
+        out *= 255
+        if clip:
+            np.clip(out, 0, 255, out=out)
+        return out
+    
+    @staticmethod
+    def xyz_to_lab_batch(xyz, out=None, white=None, dtype=None):
+        xyz, out = ColorConverter._prepare_out(xyz, out, dtype)
+        
+        np.divide(xyz, ColorConverter.profile(white, out.dtype).white, out=out)
+        ColorConverter._lab_f(out)
+        ColorConverter._lab_from_f(out)
+        return out
+    
+    @staticmethod
+    def lab_to_xyz_batch(lab, out=None, white=None, dtype=None):
+        lab, out = ColorConverter._prepare_out(lab, out, dtype)
+        
+        ColorConverter._f_from_lab(lab, out)
+        ColorConverter._lab_f_inv(out)
+        out *= ColorConverter.profile(white, out.dtype).white
+        return out
+    
+    @staticmethod
+    def rgb_to_lab_batch(rgb, out=None, table=None, chunk_size=None, white=None, dtype=None):
+        rgb, out = ColorConverter._prepare_out(rgb, out, dtype)
+        is_8bit = ColorConverter._is_8bit(rgb)
+        
+        if table is not None and is_8bit:
+            if ColorConverter.resolve_white(white) != ColorConverter.ILLUMINANTS['D65']:
+                raise ValueError("The RGB->Lab table is built for the D65 white point")
+            return table.lookup(rgb, out=out)
+        
+        linear = ColorConverter._cast(SRGB_TO_LINEAR, out)
+        matrix = ColorConverter.profile(white, out.dtype).rgb_to_lab_t
+        
+        chunk_size = chunk_size or ColorConverter.CHUNK_SIZE
+        for rgb_chunk, chunk in ColorConverter._chunks(rgb, out, chunk_size):
+            if is_8bit:
+                np.take(linear, rgb_chunk, out=chunk)
+            else:
+                np.divide(rgb_chunk, 255.0, out=chunk)
+                ColorConverter._srgb_linearize(chunk)
+            np.matmul(chunk, matrix, out=chunk)
+            ColorConverter._lab_f(chunk)
+            ColorConverter._lab_from_f(chunk)
+        return out
+    
+    @staticmethod
+    def lab_to_rgb_batch(lab, out=None, lut=None, chunk_size=None, white=None, dtype=None, gamut=None):
+        lab, out = ColorConverter._prepare_out(lab, out, dtype)
+        
+        if gamut is not None:
+            if gamut.white != ColorConverter.resolve_white(white):
+                raise ValueError(f"The gamut boundary is built for white point {gamut.white}")
+            lab = gamut.map_lab(lab, out=out, chunk_size=chunk_size)
+        
+        if lut is not None:
+            if lut.white != ColorConverter.resolve_white(white):
+                raise ValueError(f"The Lab->RGB LUT is built for white point {lut.white}")
+            return lut.apply(lab, out=out)
+        
+        matrix = ColorConverter.profile(white, out.dtype).lab_to_rgb_t
+        
+        chunk_size = chunk_size or ColorConverter.CHUNK_SIZE
+        for lab_chunk, chunk in ColorConverter._chunks(lab, out, chunk_size):
+            ColorConverter._f_from_lab(lab_chunk, chunk)
+            ColorConverter._lab_f_inv(chunk)
+            np.matmul(chunk, matrix, out=chunk)
+            ColorConverter._srgb_compand(chunk)
+            chunk *= 255
+            np.clip(chunk, 0, 255, out=chunk)
+        return out
+    
+    @staticmethod
+    def rgb_to_xyz(rgb, white=None):
+        return ColorConverter.rgb_to_xyz_batch(rgb, white=white)
+    
+    @staticmethod
+    def xyz_to_rgb(xyz, white=None):
+        return ColorConverter.xyz_to_rgb_batch(xyz, white=white).tolist()
+    
+    @staticmethod
+    def xyz_to_lab(xyz, white=None):
+        return ColorConverter.xyz_to_lab_batch(xyz, white=white).tolist()
+    
+    @staticmethod
+    def lab_to_xyz(lab, white=None):
+        return ColorConverter.lab_to_xyz_batch(lab, white=white).tolist()
+    
+    @staticmethod
+    def rgb_to_lab(rgb, white=None):
+        return ColorConverter.rgb_to_lab_batch(rgb, white=white).tolist()
+    
+    @staticmethod
+    def lab_to_rgb(lab, white=None):
+        return ColorConverter.lab_to_rgb_batch(lab, white=white).tolist()
+    
+    @staticmethod
+    def round_trip_error(dtype=np.float64, samples=1 << 20, seed=0):
+        rng = np.random.default_rng(seed)
+        rgb = rng.integers(0, 256, size=(samples, 3), dtype=np.uint8)
+        
+        lab = ColorConverter.rgb_to_lab_batch(rgb, dtype=dtype)
+        back = ColorConverter.lab_to_rgb_batch(lab, dtype=dtype)
+        return float(np.abs(back - rgb).max())
+
+SRGB_TO_LINEAR = np.arange(256) / 255.0
+ColorConverter._srgb_linearize(SRGB_TO_LINEAR)
+
+class DeltaE:
+    
+    METHODS = ('cie76', 'cie94', 'ciede2000')
+    
+    @staticmethod
+    def cie76(lab1, lab2):
+        diff = np.subtract(lab1, lab2)
+        return np.sqrt(np.einsum('...i,...i->...', diff, diff))
+    
+    @staticmethod
+    def cie94(lab1, lab2):
+        lab1 = np.asarray(lab1)
+        lab2 = np.asarray(lab2)
+        L1, a1, b1 = np.moveaxis(lab1, -1, 0)
+        L2, a2, b2 = np.moveaxis(lab2, -1, 0)
+        
+        C1 = np.hypot(a1, b1)
+        C2 = np.hypot(a2, b2)
+        dL = L1 - L2
+        dC = C1 - C2
+        dH2 = (a1 - a2) ** 2 + (b1 - b2) ** 2 - dC ** 2
+        dH2 = np.maximum(dH2, 0)
+        
+        SC = 1 + 0.045 * C1
+        SH = 1 + 0.015 * C1
+        return np.sqrt(dL ** 2 + (dC / SC) ** 2 + dH2 / SH ** 2)
+    
+    @staticmethod
+    def ciede2000(lab1, lab2):
+        lab1 = np.asarray(lab1)
+        lab2 = np.asarray(lab2)
+        L1, a1, b1 = np.moveaxis(lab1, -1, 0)
+        L2, a2, b2 = np.moveaxis(lab2, -1, 0)
+        
+        C_mean = (np.hypot(a1, b1) + np.hypot(a2, b2)) / 2
+        C_mean7 = C_mean ** 7
+        G = 0.5 * (1 - np.sqrt(C_mean7 / (C_mean7 + 25.0 ** 7)))
+        
+        a1p = (1 + G) * a1
+        a2p = (1 + G) * a2
+        C1p = np.hypot(a1p, b1)
+        C2p = np.hypot(a2p, b2)
+        h1p = np.degrees(np.arctan2(b1, a1p)) % 360
+        h2p = np.degrees(np.arctan2(b2, a2p)) % 360
+        
+        chroma_product = C1p * C2p
+        achromatic = chroma_product == 0
+        
+        dLp = L2 - L1
+        dCp = C2p - C1p
+        dhp = h2p - h1p
+        dhp = np.where(dhp > 180, dhp - 360, np.where(dhp < -180, dhp + 360, dhp))
+        dhp = np.where(achromatic, 0, dhp)
+        dHp = 2 * np.sqrt(chroma_product) * np.sin(np.radians(dhp) / 2)
+        
+        L_mean = (L1 + L2) / 2
+        Cp_mean = (C1p + C2p) / 2
+        h_sum = h1p + h2p
+        hp_mean = np.where(np.abs(h1p - h2p) <= 180, h_sum / 2,
+                           np.where(h_sum < 360, (h_sum + 360) / 2, (h_sum - 360) / 2))
+        hp_mean = np.where(achromatic, h_sum, hp_mean)
+        
+        T = (1 - 0.17 * np.cos(np.radians(hp_mean - 30))
+             + 0.24 * np.cos(np.radians(2 * hp_mean))
+             + 0.32 * np.cos(np.radians(3 * hp_mean + 6))
+             - 0.20 * np.cos(np.radians(4 * hp_mean - 63)))
+        
+        d_theta = 30 * np.exp(-((hp_mean - 275) / 25) ** 2)
+        Cp_mean7 = Cp_mean ** 7
+        RC = 2 * np.sqrt(Cp_mean7 / (Cp_mean7 + 25.0 ** 7))
+        L_offset2 = (L_mean - 50) ** 2
+        SL = 1 + 0.015 * L_offset2 / np.sqrt(20 + L_offset2)
+        SC = 1 + 0.045 * Cp_mean
+        SH = 1 + 0.015 * Cp_mean * T
+        RT = -np.sin(np.radians(2 * d_theta)) * RC
+        
+        dL_term = dLp / SL
+        dC_term = dCp / SC
+        dH_term = dHp / SH
+        return np.sqrt(dL_term ** 2 + dC_term ** 2 + dH_term ** 2 + RT * dC_term * dH_term)
+    
+    @staticmethod
+    def _metric(method):
+        if method not in DeltaE.METHODS:
+            raise ValueError(f"Unknown delta E method '{method}', expected one of {DeltaE.METHODS}")
+        return getattr(DeltaE, method)
+    
+    @staticmethod
+    def compute(lab1, lab2, method='cie76'):
+        return DeltaE._metric(method)(lab1, lab2)
+    
+    @staticmethod
+    def _blocks(count, columns, block_elements):
+        rows = max(1, block_elements // max(columns, 1))
+        for start in range(0, count, rows):
+            yield start, min(start + rows, count)
+    
+    @staticmethod
+    def pairwise(lab1, lab2, method='cie76', out=None, dtype=np.float32, block_elements=1 << 20):
+        metric = DeltaE._metric(method)
+        lab1 = np.asarray(lab1, dtype=np.float64).reshape(-1, 3)
+        lab2 = np.asarray(lab2, dtype=np.float64).reshape(-1, 3)
+        
+        if out is None:
+            out = np.empty((len(lab1), len(lab2)), dtype=dtype)
+        elif out.shape != (len(lab1), len(lab2)):
+            raise ValueError(f"Output shape {out.shape} does not match ({len(lab1)}, {len(lab2)})")
+        
+        for start, stop in DeltaE._blocks(len(lab1), len(lab2), block_elements):
+            out[start:stop] = metric(lab1[start:stop, None, :], lab2[None, :, :])
+        return out
+    
+    @staticmethod
+    def nearest(lab, palette, method='cie76', candidates=None, block_elements=1 << 22):
+        metric = DeltaE._metric(method)
+        lab = np.asarray(lab, dtype=np.float64)
+        palette = np.asarray(palette, dtype=np.float64).reshape(-1, 3)
+        flat = lab.reshape(-1, 3)
+        
+        use_scores = method == 'cie76' or candidates
+        if use_scores:
+            palette_t = -2 * palette.T
+            palette_norm = np.einsum('ij,ij->i', palette, palette)
+            shortlist_size = min(candidates or 1, len(palette))
+        
+        indices = np.empty(len(flat), dtype=np.intp)
+        for start, stop in DeltaE._blocks(len(flat), len(palette), block_elements):
+            block = flat[start:stop]
+            
+            if not use_scores:
+                best = metric(block[:, None, :], palette[None, :, :]).argmin(axis=1)
+            else:
+                scores = block @ palette_t
+                scores += palette_norm
+                if method == 'cie76':
+                    best = scores.argmin(axis=1)
+                else:
+                    if shortlist_size < len(palette):
+                        shortlist = np.argpartition(scores, shortlist_size - 1, axis=1)[:, :shortlist_size]
+                    else:
+                        shortlist = np.broadcast_to(np.arange(len(palette)), scores.shape)
+                    pick = metric(block[:, None, :], palette[shortlist]).argmin(axis=1)
+                    best = shortlist[np.arange(len(block)), pick]
+            
+            indices[start:stop] = best
+        
+        distances = metric(flat, palette[indices])
+        return indices.reshape(lab.shape[:-1]), distances.reshape(lab.shape[:-1])
+
+class PaletteIndex:
+    
+    def __init__(self, palette_rgb, white=None, cache_bits=8):
+        if not 1 <= cache_bits <= 8:
+            raise ValueError(f"cache_bits must be between 1 and 8, got {cache_bits}")
+        
+        self.palette_rgb = np.asarray(palette_rgb).reshape(-1, 3)
+        if len(self.palette_rgb) == 0:
+            raise ValueError("Palette must contain at least one color")
+        
+        self.white = white
+        self.palette_lab = ColorConverter.rgb_to_lab_batch(self.palette_rgb, white=white)
+        self.tree = None
+        if HAS_SCIPY:
+            from scipy.spatial import cKDTree
+            self.tree = cKDTree(self.palette_lab)
+        
+        self.cache_bits = cache_bits
+        self._shift = 8 - cache_bits
+        self._cache = np.full(1 << (3 * cache_bits), -1, dtype=np.int32)
+        self.hits = 0
+        self.misses = 0
+    
+    def query_lab(self, lab):
+        lab = np.asarray(lab, dtype=np.float64)
+        if self.tree is not None:
+            _, indices = self.tree.query(lab, workers=-1)
+            return indices
+        return DeltaE.nearest(lab, self.palette_lab)[0]
+    
+    def _keys(self, rgb):
+        keys = (rgb[..., 0] >> self._shift).astype(np.int32)
+        for channel in (1, 2):
+            keys <<= self.cache_bits
+            keys |= rgb[..., channel] >> self._shift
+        return keys
+    
+    def _decode(self, keys):
+        bits = self.cache_bits
+        mask = (1 << bits) - 1
+        quantized = np.stack([keys >> (2 * bits), (keys >> bits) & mask, keys & mask], axis=-1)
+        return (quantized << self._shift) + ((1 << self._shift) >> 1)
+    
+    def query_rgb(self, rgb):
+        rgb = np.asarray(rgb)
+        if not ColorConverter._is_8bit(rgb):
+            raise ValueError("query_rgb expects 8-bit RGB values")
+        
+        keys = self._keys(rgb)
+        indices = np.take(self._cache, keys)
+        missing_count = 0
+        
+        if indices.size and indices.min() < 0:
+            missing = indices < 0
+            missing_count = int(np.count_nonzero(missing))
+            
+            pending = np.zeros(len(self._cache), dtype=bool)
+            pending[keys[missing]] = True
+            new_keys = np.flatnonzero(pending)
+            
+            lab = ColorConverter.rgb_to_lab_batch(self._decode(new_keys), white=self.white)
+            self._cache[new_keys] = self.query_lab(lab)
+            indices = np.take(self._cache, keys)
+        
+        self.misses += missing_count
+        self.hits += indices.size - missing_count
+        return indices
+    
+    def map_image(self, rgb):
+        return self.palette_rgb[self.query_rgb(rgb)]
+    
+    def clear_cache(self):
+        self._cache.fill(-1)
+        self.hits = 0
+        self.misses = 0
+
+class RgbLabTable:
+    
+    SIZE = 1 << 24
+    SCALE = 100
+    
+    def __init__(self, table):
+        if table.shape != (RgbLabTable.SIZE, 3):
+            raise ValueError(f"RGB->Lab table must have shape ({RgbLabTable.SIZE}, 3), got {table.shape}")
+        self.table = table
+    
+    @staticmethod
+    def _fill(table, chunk_size=1 << 18):
+        rgb = np.empty((chunk_size, 3), dtype=np.uint8)
+        lab = np.empty((chunk_size, 3))
+        
+        for start in range(0, RgbLabTable.SIZE, chunk_size):
+            codes = np.arange(start, start + chunk_size)
+            rgb[:, 0] = codes >> 16
+            rgb[:, 1] = (codes >> 8) & 0xFF
+            rgb[:, 2] = codes & 0xFF
+            
+            ColorConverter.rgb_to_lab_batch(rgb, out=lab)
+            lab *= RgbLabTable.SCALE
+            np.rint(lab, out=lab)
+            table[start:start + chunk_size] = lab
+    
+    @classmethod
+    def build(cls):
+        table = np.empty((cls.SIZE, 3), dtype=np.int16)
+        cls._fill(table)
+        return cls(table)
+    
+    @classmethod
+    def create(cls, path):
+        table = np.lib.format.open_memmap(path, mode='w+', dtype=np.int16, shape=(cls.SIZE, 3))
+        cls._fill(table)
+        table.flush()
+        del table
+        return cls.open(path)
+    
+    @classmethod
+    def open(cls, path):
+        return cls(np.load(path, mmap_mode='r'))
+    
+    @classmethod
+    def open_or_create(cls, path):
+        if os.path.exists(path):
+            return cls.open(path)
+        return cls.create(path)
+    
+    def save(self, path):
+        np.save(path, self.table)
+    
+    def lookup(self, rgb, out=None):
+        rgb, out = ColorConverter._prepare_out(rgb, out)
+        
+        codes = rgb[..., 0].astype(np.intp) << 16
+        codes |= rgb[..., 1].astype(np.intp) << 8
+        codes |= rgb[..., 2]
+        
+        np.divide(np.take(self.table, codes, axis=0), RgbLabTable.SCALE, out=out)
+        return out
+
+class LabRgbLut:
+    
+    LAB_MIN = np.array([0.0, -128.0, -128.0])
+    LAB_MAX = np.array([100.0, 128.0, 128.0])
+    
+    def __init__(self, size=33, error_samples=200000, white=None):
+        if size < 2:
+            raise ValueError(f"LUT size must be at least 2, got {size}")
+        
+        self.size = size
+        self.white = ColorConverter.resolve_white(white)
+        s0, s1, s2 = size * size, size, 1
+        self._strides = (s0, s1, s2)
+        self._scale = ((size - 1) / (LabRgbLut.LAB_MAX - LabRgbLut.LAB_MIN)).astype(np.float32)
+        self._offset = -LabRgbLut.LAB_MIN * self._scale
+        self._hi_steps = np.array([s2, s2, s1, s1, s2, s0, s2, s0], dtype=np.int32)
+        self._lo_steps = np.array([s0, s2, s0, s2, s1, s1, s2, s2], dtype=np.int32)
+        
+        axes = [np.linspace(lo, hi, size) for lo, hi in zip(LabRgbLut.LAB_MIN, LabRgbLut.LAB_MAX)]
+        grid = np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1)
+        self.table = ColorConverter.lab_to_rgb_batch(grid, white=self.white, dtype=np.float32).reshape(-1, 3)
+        
+        self.max_delta_e = self.measure_error(error_samples) if error_samples else None
+    
+    def _apply_chunk(self, lab, out):
+        pos = np.multiply(lab, self._scale, dtype=np.float32)
+        pos += self._offset
+        np.clip(pos, 0, self.size - 1, out=pos)
+        
+        idx = pos.astype(np.int32)
+        np.minimum(idx, self.size - 2, out=idx)
+        pos -= idx
+        fx, fy, fz = pos.T
+        s0, s1, s2 = self._strides
+        
+        code = np.greater_equal(fx, fy).view(np.int8) << 2
+        code |= np.greater_equal(fy, fz).view(np.int8) << 1
+        code |= np.greater_equal(fx, fz).view(np.int8)
+        
+        hi = np.maximum(fx, fy)
+        np.maximum(hi, fz, out=hi)
+        lo = np.minimum(fx, fy)
+        np.minimum(lo, fz, out=lo)
+        mid = fx + fy
+        mid += fz
+        mid -= hi
+        mid -= lo
+        
+        base = idx[:, 0] * s0
+        base += idx[:, 1] * s1
+        base += idx[:, 2]
+        corner = base + (s0 + s1 + s2)
+        
+        table = self.table
+        acc = np.take(table, base, axis=0)
+        acc *= (1 - hi)[:, None]
+        vertex = np.take(table, base + np.take(self._hi_steps, code), axis=0)
+        vertex *= (hi - mid)[:, None]
+        acc += vertex
+        vertex = np.take(table, corner - np.take(self._lo_steps, code), axis=0)
+        vertex *= (mid - lo)[:, None]
+        acc += vertex
+        vertex = np.take(table, corner, axis=0)
+        vertex *= lo[:, None]
+        acc += vertex
+        out[...] = acc
+    
+    def apply(self, lab, out=None, chunk_size=1 << 14, dtype=None):
+        lab, out = ColorConverter._prepare_out(lab, out, dtype)
+        
+        flat_lab = lab.reshape(-1, 3)
+        flat_out = out.reshape(-1, 3)
+        for start in range(0, len(flat_lab), chunk_size):
+            stop = start + chunk_size
+            self._apply_chunk(flat_lab[start:stop], flat_out[start:stop])
+        return out
+    
+    def measure_error(self, samples=200000, seed=0):
+        rng = np.random.default_rng(seed)
+        rgb = rng.integers(0, 256, size=(samples, 3), dtype=np.uint8)
+        lab = ColorConverter.rgb_to_lab_batch(rgb, white=self.white)
+        
+        exact = ColorConverter.rgb_to_lab_batch(ColorConverter.lab_to_rgb_batch(lab, white=self.white), white=self.white)
+        approx = ColorConverter.rgb_to_lab_batch(self.apply(lab), white=self.white)
+        return float(np.sqrt(((exact - approx) ** 2).sum(axis=-1)).max())
+    
+    def to_cube(self, path, title="Lab to sRGB"):
+        rgb = self.table.reshape(self.size, self.size, self.size, 3).transpose(2, 1, 0, 3).reshape(-1, 3) / 255
+        
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f'TITLE "{title}"\n')
+            f.write(f"LUT_3D_SIZE {self.size}\n")
+            f.write("DOMAIN_MIN {:.1f} {:.1f} {:.1f}\n".format(*LabRgbLut.LAB_MIN))
+            f.write("DOMAIN_MAX {:.1f} {:.1f} {:.1f}\n".format(*LabRgbLut.LAB_MAX))
+            for r, g, b in rgb:
+                f.write(f"{r:.6f} {g:.6f} {b:.6f}\n")
+
+class GamutMapper:
+    
+    MAX_CHROMA = 200.0
+    TOLERANCE = 1e-4
+    
+    def __init__(self, l_bins=101, hue_bins=360, iterations=32, error_samples=200000, white=None):
+        if l_bins < 2 or hue_bins < 3:
+            raise ValueError(f"Need at least 2 lightness and 3 hue bins, got {l_bins} and {hue_bins}")
+        
+        self.l_bins = l_bins
+        self.hue_bins = hue_bins
+        self.white = ColorConverter.resolve_white(white)
+        self._l_scale = (l_bins - 1) / 100
+        self._h_scale = hue_bins / (2 * np.pi)
+        
+        boundary = self._search_boundary(iterations)
+        self.max_chroma = np.concatenate([boundary, boundary[:, :1]], axis=1)
+        
+        self.max_delta_e = self.measure_error(error_samples) if error_samples else None
+    
+    def _linear_rgb(self, lab, out):
+        ColorConverter._f_from_lab(lab, out)
+        ColorConverter._lab_f_inv(out)
+        np.matmul(out, ColorConverter.profile(self.white, out.dtype).lab_to_rgb_t, out=out)
+        return out
+    
+    def _search_boundary(self, iterations):
+        hue = np.arange(self.hue_bins) / self._h_scale
+        cos, sin = np.cos(hue), np.sin(hue)
+        
+        lo = np.zeros((self.l_bins, self.hue_bins))
+        hi = np.full_like(lo, GamutMapper.MAX_CHROMA)
+        lab = np.empty(lo.shape + (3,))
+        lab[..., 0] = np.linspace(0, 100, self.l_bins)[:, None]
+        linear = np.empty_like(lab)
+        
+        for _ in range(iterations):
+            mid = lo + hi
+            mid /= 2
+            np.multiply(mid, cos, out=lab[..., 1])
+            np.multiply(mid, sin, out=lab[..., 2])
+            inside = GamutMapper._inside(self._linear_rgb(lab, linear), 0)
+            np.copyto(lo, mid, where=inside)
+            np.copyto(hi, mid, where=~inside)
+        
+        return lo
+    
+    @staticmethod
+    def _inside(linear, tolerance=TOLERANCE):
+        return ((linear >= -tolerance) & (linear <= 1 + tolerance)).all(axis=-1)
+    
+    def in_gamut(self, lab, tolerance=TOLERANCE):
+        lab, linear = ColorConverter._prepare_out(lab, None)
+        return GamutMapper._inside(self._linear_rgb(lab, linear), tolerance)
+    
+    def chroma_limit(self, lightness, hue):
+        l_pos = np.clip(lightness, 0, 100) * self._l_scale
+        h_pos = np.mod(hue, 2 * np.pi) * self._h_scale
+        
+        l0 = np.minimum(l_pos.astype(np.intp), self.l_bins - 2)
+        h0 = np.minimum(h_pos.astype(np.intp), self.hue_bins - 1)
+        l_pos -= l0
+        h_pos -= h0
+        
+        table = self.max_chroma
+        low = table[l0, h0] * (1 - h_pos) + table[l0, h0 + 1] * h_pos
+        high = table[l0 + 1, h0] * (1 - h_pos) + table[l0 + 1, h0 + 1] * h_pos
+        high -= low
+        high *= l_pos
+        high += low
+        return high
+    
+    def _map_chunk(self, lab, out):
+        outside = ~GamutMapper._inside(self._linear_rgb(lab, np.empty_like(out)))
+        lightness = np.clip(lab[..., 0], 0, 100)
+        chroma = np.hypot(lab[..., 1], lab[..., 2])
+        limit = self.chroma_limit(lightness, np.arctan2(lab[..., 2], lab[..., 1]))
+        
+        outside &= chroma > limit
+        scale = np.divide(limit, chroma, out=np.ones_like(chroma), where=outside)
+        np.multiply(lab[..., 1], scale, out=out[..., 1])
+        np.multiply(lab[..., 2], scale, out=out[..., 2])
+        out[..., 0] = lightness
+    
+    def map_lab(self, lab, out=None, chunk_size=None, dtype=None):
+        lab, out = ColorConverter._prepare_out(lab, out, dtype)
+        
+        chunk_size = chunk_size or ColorConverter.CHUNK_SIZE
+        for lab_chunk, chunk in ColorConverter._chunks(lab, out, chunk_size):
+            self._map_chunk(lab_chunk, chunk)
+        return out
+    
+    def measure_error(self, samples=200000, seed=0):
+        rng = np.random.default_rng(seed)
+        lab = rng.uniform(LabRgbLut.LAB_MIN, LabRgbLut.LAB_MAX, size=(samples, 3))
+        
+        mapped = self.map_lab(lab)
+        clipped = ColorConverter.rgb_to_lab_batch(ColorConverter.lab_to_rgb_batch(mapped, white=self.white),
+                                                  white=self.white)
+        return float(DeltaE.cie76(mapped, clipped).max())
+
+class TiledConverter:
+    
+    CONVERSIONS = ('rgb_to_xyz', 'xyz_to_rgb', 'xyz_to_lab', 'lab_to_xyz', 'rgb_to_lab', 'lab_to_rgb')
+    
+    def __init__(self, workers=None, tile_rows=64):
+        if tile_rows < 1:
+            raise ValueError(f"tile_rows must be positive, got {tile_rows}")
+        
+        self.workers = workers or os.cpu_count() or 1
+        self.tile_rows = tile_rows
+    
+    def bands(self, rows):
+        return [(start, min(start + self.tile_rows, rows)) for start in range(0, rows, self.tile_rows)]
+    
+    def convert(self, image, conversion, out=None, dtype=None, **kwargs):
+        if conversion not in TiledConverter.CONVERSIONS:
+            raise ValueError(f"Unknown conversion '{conversion}', expected one of {TiledConverter.CONVERSIONS}")
+        
+        func = getattr(ColorConverter, f"{conversion}_batch")
+        image, out = ColorConverter._prepare_out(image, out, dtype)
+        if image.ndim < 2:
+            return func(image, out=out, **kwargs)
+        
+        def convert_band(band):
+            start, stop = band
+            func(image[start:stop], out=out[start:stop], **kwargs)
+        
+        bands = self.bands(len(image))
+        if self.workers == 1 or len(bands) == 1:
+            for band in bands:
+                convert_band(band)
+            return out
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for _ in executor.map(convert_band, bands):
+                pass
+        
+        return out
+
+class StreamingConverter:
+    
+    TIFF_EXTENSIONS = ('.tif', '.tiff')
+    
+    def __init__(self, strip_rows=256, tiler=None):
+        if strip_rows < 1:
+            raise ValueError(f"strip_rows must be positive, got {strip_rows}")
+        
+        self.strip_rows = strip_rows
+        self.tiler = tiler
+    
+    @staticmethod
+    def _is_tiff(path):
+        return str(path).lower().endswith(StreamingConverter.TIFF_EXTENSIONS)
+    
+    @staticmethod
+    def open_input(path, shape=None, dtype=np.uint8):
+        if str(path).lower().endswith('.npy'):
+            return np.load(path, mmap_mode='r')
+        
+        if StreamingConverter._is_tiff(path):
+            if not HAS_TIFFFILE:
+                raise RuntimeError("Streaming TIFF input requires the tifffile package")
+            import tifffile
+            try:
+                return tifffile.memmap(path, mode='r')
+            except ValueError as e:
+                raise ValueError(f"TIFF {path} is compressed or not contiguous and cannot be streamed: {e}")
+        
+        if shape is None:
+            raise ValueError("Raw input requires an explicit (rows, columns, 3) shape")
+        return np.memmap(path, dtype=dtype, mode='r', shape=tuple(shape))
+    
+    @staticmethod
+    def create_output(path, shape, dtype):
+        if str(path).lower().endswith('.npy'):
+            return np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+        
+        if StreamingConverter._is_tiff(path):
+            if not HAS_TIFFFILE:
+                raise RuntimeError("Streaming TIFF output requires the tifffile package")
+            import tifffile
+            return tifffile.memmap(path, shape=shape, dtype=dtype, photometric='rgb')
+        
+        return np.memmap(path, dtype=dtype, mode='w+', shape=shape)
+    
+    def convert(self, src, dst, conversion, shape=None, src_dtype=np.uint8, dtype=np.float32,
+                progress_callback=None, **kwargs):
+        if conversion not in TiledConverter.CONVERSIONS:
+            raise ValueError(f"Unknown conversion '{conversion}', expected one of {TiledConverter.CONVERSIONS}")
+        
+        func = getattr(ColorConverter, f"{conversion}_batch")
+        source = StreamingConverter.open_input(src, shape, src_dtype)
+        if source.ndim != 3 or source.shape[-1] != 3:
+            raise ValueError(f"Expected an image of shape (rows, columns, 3), got {source.shape}")
+        
+        target = StreamingConverter.create_output(dst, source.shape, dtype)
+        rows = len(source)
+        
+        try:
+            for start in range(0, rows, self.strip_rows):
+                stop = min(start + self.strip_rows, rows)
+                if self.tiler is not None:
+                    self.tiler.convert(source[start:stop], conversion, out=target[start:stop], **kwargs)
+                else:
+                    func(source[start:stop], out=target[start:stop], **kwargs)
+                target.flush()
+                
+                if progress_callback:
+                    progress_callback(stop, rows)
+        finally:
+            del target
+            del source
@@ -0,0 +1,160 @@
+﻿import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+from datetime import datetime
+
+import numpy as np
+
+from color_models import ColorConverter
+
+SCALAR_CASES = {
+    'rgb_to_xyz': lambda c: ColorConverter.rgb_to_xyz(c['rgb']),
+    'xyz_to_rgb': lambda c: ColorConverter.xyz_to_rgb(c['xyz']),
+    'xyz_to_lab': lambda c: ColorConverter.xyz_to_lab(c['xyz']),
+    'lab_to_xyz': lambda c: ColorConverter.lab_to_xyz(c['lab']),
+    'round_trip': lambda c: ColorConverter.lab_to_rgb(ColorConverter.rgb_to_lab(c['rgb'])),
+}
+
+BATCH_CASES = {
+    'rgb_to_xyz': ('rgb', lambda src, out: ColorConverter.rgb_to_xyz_batch(src, out=out)),
+    'xyz_to_rgb': ('xyz', lambda src, out: ColorConverter.xyz_to_rgb_batch(src, out=out)),
+    'xyz_to_lab': ('xyz', lambda src, out: ColorConverter.xyz_to_lab_batch(src, out=out)),
+    'lab_to_xyz': ('lab', lambda src, out: ColorConverter.lab_to_xyz_batch(src, out=out)),
+    'rgb_to_lab': ('rgb', lambda src, out: ColorConverter.rgb_to_lab_batch(src, out=out)),
+    'lab_to_rgb': ('lab', lambda src, out: ColorConverter.lab_to_rgb_batch(src, out=out)),
+    'round_trip': ('rgb', lambda src, out: ColorConverter.lab_to_rgb_batch(
+        ColorConverter.rgb_to_lab_batch(src, out=out), out=out)),
+}
+
+DEFAULT_SIZES = [1_000, 1_000_000, 16_777_216]
+
+def git_revision():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def environment():
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+    }
+
+def best_time(func, repeat, number=1):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+def make_inputs(pixels, dtype, seed=0):
+    rng = np.random.default_rng(seed)
+    rgb = rng.integers(0, 256, size=(pixels, 3), dtype=np.uint8)
+    xyz = ColorConverter.rgb_to_xyz_batch(rgb, dtype=dtype)
+    lab = ColorConverter.xyz_to_lab_batch(xyz, dtype=dtype)
+    return {'rgb': rgb, 'xyz': xyz, 'lab': lab}
+
+def bench_scalar(repeat, number=2000):
+    colors = {'rgb': [200, 120, 40], 'xyz': [41.24, 21.26, 1.93], 'lab': [53.24, 80.09, 67.20]}
+    results = []
+    for name, case in SCALAR_CASES.items():
+        seconds = best_time(lambda: case(colors), repeat, number)
+        results.append({
+            'case': f"scalar/{name}",
+            'pixels': 1,
+            'seconds': seconds,
+            'ops_per_sec': 1 / seconds,
+            'mb_per_sec': None,
+        })
+    return results
+
+def bench_batch(sizes, repeat, dtype):
+    results = []
+    for pixels in sizes:
+        inputs = make_inputs(pixels, dtype)
+        out = np.empty((pixels, 3), dtype=dtype)
+
+        for name, (source, case) in BATCH_CASES.items():
+            src = inputs[source]
+            seconds = best_time(lambda: case(src, out), repeat)
+            moved = src.nbytes + out.nbytes
+            results.append({
+                'case': f"batch/{name}",
+                'pixels': pixels,
+                'seconds': seconds,
+                'ops_per_sec': pixels / seconds,
+                'mb_per_sec': moved / seconds / 1e6,
+            })
+
+        del inputs, out
+    return results
+
+def compare(results, baseline_path):
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    previous = {(r['case'], r['pixels']): r for r in baseline['results']}
+    print(f"\nComparison with {baseline_path} (revision {baseline['environment'].get('revision')}):")
+    for result in results:
+        old = previous.get((result['case'], result['pixels']))
+        if old is None:
+            continue
+        ratio = result['ops_per_sec'] / old['ops_per_sec']
+        marker = "  <-- slower" if ratio < 0.9 else ""
+        print(f"  {result['case']:<22} {result['pixels']:>10}  {ratio:6.2f}x{marker}")
+
+def print_results(results):
+    print(f"{'case':<22} {'pixels':>10} {'seconds':>12} {'ops/sec':>14} {'MB/s':>10}")
+    print("-" * 72)
+    for r in results:
+        mb = f"{r['mb_per_sec']:.1f}" if r['mb_per_sec'] is not None else "-"
+        print(f"{r['case']:<22} {r['pixels']:>10} {r['seconds']:>12.6f} {r['ops_per_sec']:>14.0f} {mb:>10}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ColorConverter scalar and batch conversions")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="batch sizes in pixels (default: 1K, 1M, 16M)")
+    parser.add_argument('--repeat', type=int, default=5, help="repetitions, best time is reported")
+    parser.add_argument('--dtype', choices=['float32', 'float64'], default='float64')
+    parser.add_argument('--skip-scalar', action='store_true', help="skip single-color benchmarks")
+    parser.add_argument('--output', help="write results as JSON to this path")
+    parser.add_argument('--compare', help="JSON results of a previous run to compare against")
+    args = parser.parse_args(argv)
+
+    dtype = np.dtype(args.dtype)
+    results = [] if args.skip_scalar else bench_scalar(args.repeat)
+    results += bench_batch(args.sizes, args.repeat, dtype)
+
+    print_results(results)
+
+    report = {
+        'environment': environment(),
+        'settings': {'sizes': args.sizes, 'repeat': args.repeat, 'dtype': args.dtype},
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+    return report
+
+if __name__ == "__main__":
+    main()
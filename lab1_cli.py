@@ -0,0 +1,211 @@
+﻿import os
+import re
+import sys
+import argparse
+from itertools import islice
+
+import numpy as np
+
+from color_models import ColorConverter, GamutMapper
+
+SPACES = ('rgb', 'xyz', 'lab')
+FORMATS = ('csv', 'npy', 'hex')
+HEX_CODE = re.compile(r'[0-9A-Fa-f]{6}')
+
+def detect_format(path, explicit):
+    if explicit:
+        return explicit
+    if path and path != '-':
+        extension = os.path.splitext(path)[1].lower().lstrip('.')
+        if extension in FORMATS:
+            return extension
+        if extension == 'txt':
+            return 'hex'
+    return 'csv'
+
+def convert_chunk(values, source, target, white, dtype, gamut=None):
+    if source == target:
+        return np.asarray(values, dtype=dtype)
+    func = getattr(ColorConverter, f"{source}_to_{target}_batch")
+    if gamut is not None:
+        return func(values, white=white, dtype=dtype, gamut=gamut)
+    return func(values, white=white, dtype=dtype)
+
+def parse_csv(lines, delimiter):
+    rows = [line.split(delimiter) for line in lines if line.strip()]
+    values = np.array(rows, dtype=np.float64)
+    if values.ndim != 2 or values.shape[1] != 3:
+        raise ValueError("Each CSV row must contain exactly three components")
+    return values
+
+def parse_hex(lines):
+    codes = [line.strip().lstrip('#') for line in lines if line.strip()]
+    for code in codes:
+        if not HEX_CODE.fullmatch(code):
+            raise ValueError(f"Invalid hex color '#{code}': expected exactly 6 hex digits")
+    packed = np.array([int(code, 16) for code in codes], dtype=np.int64)
+    return np.stack([(packed >> 16) & 0xFF, (packed >> 8) & 0xFF, packed & 0xFF], axis=-1).astype(np.uint8)
+
+def format_csv(values, delimiter, precision):
+    if precision == 0:
+        rows = np.rint(values).astype(np.int64)
+        return "".join(delimiter.join(str(c) for c in row) + "\n" for row in rows.tolist())
+    pattern = delimiter.join([f"{{:.{precision}f}}"] * 3) + "\n"
+    return "".join(pattern.format(*row) for row in values.tolist())
+
+def format_hex(values):
+    rgb = np.clip(np.rint(values), 0, 255).astype(np.int64)
+    packed = (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+    return "".join(f"#{code:06X}\n" for code in packed.tolist())
+
+def read_text_chunks(stream, chunk_size, skip_header):
+    if skip_header:
+        next(stream, None)
+    while True:
+        lines = list(islice(stream, chunk_size))
+        if not lines:
+            break
+        yield lines
+
+def convert_text(args, in_format, out_format, stream_in, stream_out):
+    converted = 0
+    for lines in read_text_chunks(stream_in, args.chunk_size, args.skip_header):
+        values = parse_hex(lines) if in_format == 'hex' else parse_csv(lines, args.delimiter)
+        if not len(values):
+            continue
+        result = convert_chunk(values, args.source, args.target, args.white, args.dtype, args.gamut)
+        if out_format == 'hex':
+            stream_out.write(format_hex(result))
+        else:
+            stream_out.write(format_csv(result, args.delimiter, args.precision))
+        converted += len(values)
+    return converted
+
+def read_npy_stream(stream, chunk_size):
+    version = np.lib.format.read_magic(stream)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(stream)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(stream)
+    if dtype.hasobject:
+        raise ValueError("NPY input with object dtype is not supported")
+
+    size = int(np.prod(shape))
+    if size % 3:
+        raise ValueError("NPY input must contain a whole number of 3-component colors")
+    rows = size // 3
+
+    if fortran_order:
+        data = np.frombuffer(stream.read(size * dtype.itemsize), dtype=dtype)
+        source = data.reshape(shape, order='F').reshape(-1, 3)
+        return rows, (source[start:start + chunk_size] for start in range(0, rows, chunk_size))
+
+    def chunks():
+        for start in range(0, rows, chunk_size):
+            count = min(chunk_size, rows - start) * 3
+            data = stream.read(count * dtype.itemsize)
+            if len(data) < count * dtype.itemsize:
+                raise ValueError("NPY input ended before the declared shape")
+            yield np.frombuffer(data, dtype=dtype).reshape(-1, 3)
+
+    return rows, chunks()
+
+def load_npy(args):
+    if args.input == '-':
+        return read_npy_stream(sys.stdin.buffer, args.chunk_size)
+    source = np.load(args.input, mmap_mode='r').reshape(-1, 3)
+    return len(source), (source[start:start + args.chunk_size] for start in range(0, len(source), args.chunk_size))
+
+def convert_npy(args, out_format, stream_out):
+    rows, chunks = load_npy(args)
+
+    target = None
+    if out_format == 'npy':
+        if not args.output or args.output == '-':
+            raise ValueError("NPY output requires --output with a file path")
+        target = np.lib.format.open_memmap(args.output, mode='w+', dtype=args.dtype, shape=(rows, 3))
+
+    start = 0
+    for chunk in chunks:
+        stop = start + len(chunk)
+        result = convert_chunk(chunk, args.source, args.target, args.white, args.dtype, args.gamut)
+        if target is not None:
+            target[start:stop] = result
+        elif out_format == 'hex':
+            stream_out.write(format_hex(result))
+        else:
+            stream_out.write(format_csv(result, args.delimiter, args.precision))
+        start = stop
+
+    if target is not None:
+        target.flush()
+    return rows
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Convert color lists between RGB, XYZ and Lab without the GUI")
+    parser.add_argument('input', nargs='?', default='-', help="input file, or - for stdin (default)")
+    parser.add_argument('-o', '--output', help="output file (default: stdout)")
+    parser.add_argument('--from', dest='source', choices=SPACES, default='rgb', help="input color space")
+    parser.add_argument('--to', dest='target', choices=SPACES, default='lab', help="output color space")
+    parser.add_argument('--input-format', choices=FORMATS, help="input format (default: from extension, else csv)")
+    parser.add_argument('--output-format', choices=FORMATS, help="output format (default: from extension, else csv)")
+    parser.add_argument('--white', default=None, help="white point: D65 (default), D50 or A")
+    parser.add_argument('--dtype', choices=['float32', 'float64'], default='float64')
+    parser.add_argument('--delimiter', default=',', help="CSV delimiter (default: ,)")
+    parser.add_argument('--precision', type=int, help="decimal places in CSV output (default: 0 for RGB, 4 otherwise)")
+    parser.add_argument('--gamut-map', action='store_true',
+                        help="map out-of-gamut colors onto the sRGB boundary instead of clipping (--to rgb)")
+    parser.add_argument('--skip-header', action='store_true', help="skip the first line of text input")
+    parser.add_argument('--chunk-size', type=int, default=65536, help="colors converted per chunk")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    in_format = detect_format(args.input, args.input_format)
+    out_format = detect_format(args.output, args.output_format)
+
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be positive")
+    if in_format == 'hex' and args.source != 'rgb':
+        parser.error("hex input is only valid with --from rgb")
+    if out_format == 'hex' and args.target != 'rgb':
+        parser.error("hex output is only valid with --to rgb")
+    if args.gamut_map and (args.target != 'rgb' or args.source == 'rgb'):
+        parser.error("--gamut-map is only valid with --to rgb from xyz or lab")
+    if args.precision is None:
+        args.precision = 0 if args.target == 'rgb' else 4
+
+    stream_out = None
+    try:
+        args.gamut = GamutMapper(white=args.white, error_samples=0) if args.gamut_map else None
+        
+        if out_format != 'npy':
+            if args.output and args.output != '-':
+                stream_out = open(args.output, 'w', encoding='utf-8', newline='\n')
+            else:
+                stream_out = sys.stdout
+
+        if in_format == 'npy':
+            converted = convert_npy(args, out_format, stream_out)
+        else:
+            if out_format == 'npy':
+                parser.error("NPY output requires NPY input")
+            if args.input == '-':
+                converted = convert_text(args, in_format, out_format, sys.stdin, stream_out)
+            else:
+                with open(args.input, 'r', encoding='utf-8') as stream_in:
+                    converted = convert_text(args, in_format, out_format, stream_in, stream_out)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if stream_out is not None and stream_out is not sys.stdout:
+            stream_out.close()
+
+    print(f"Converted {converted} colors {args.source} -> {args.target}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,1052 +1,2287 @@
-﻿import os
-import sys
-import time
-import struct
-import threading
-import queue
-from pathlib import Path
-from datetime import datetime
-from dataclasses import dataclass
-from typing import List, Dict, Optional, Tuple
-import concurrent.futures
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
-from tkinter.font import Font
-from PIL import Image, ImageTk
-
-try:
-    import jpegio
-    HAS_JPEGIO = True
-except ImportError:
-    HAS_JPEGIO = False
-
-try:
-    import numpy as np
-    HAS_NUMPY = True
-except ImportError:
-    HAS_NUMPY = False
-
-@dataclass
-class ImageInfo:
-    filename: str
-    filepath: str
-    file_size: int
-    width: int
-    height: int
-    resolution_x: Optional[float] = None
-    resolution_y: Optional[float] = None
-    color_depth: int = 0
-    compression: str = "Unknown"
-    format: str = "Unknown"
-    has_palette: bool = False
-    palette_colors: int = 0
-    additional_info: Dict = None
-    
-    def __post_init__(self):
-        if self.additional_info is None:
-            self.additional_info = {}
-
-class ImageFileAnalyzer:
-    def __init__(self):
-        self.supported_formats = {'.jpg', '.jpeg', '.gif', '.tif', '.tiff', '.bmp', '.png', '.pcx'}
-        self.total_files_processed = 0
-        self.processing_time = 0
-        
-    def analyze_file(self, filepath: str) -> Optional[ImageInfo]:
-        try:
-            filepath = Path(filepath)
-            if not filepath.exists():
-                return None
-                
-            file_size = filepath.stat().st_size
-            extension = filepath.suffix.lower()
-            
-            if extension in ['.jpg', '.jpeg']:
-                return self._analyze_jpeg(filepath, file_size)
-            elif extension == '.gif':
-                return self._analyze_gif(filepath, file_size)
-            elif extension in ['.tif', '.tiff']:
-                return self._analyze_tiff(filepath, file_size)
-            elif extension == '.bmp':
-                return self._analyze_bmp(filepath, file_size)
-            elif extension == '.png':
-                return self._analyze_png(filepath, file_size)
-            elif extension == '.pcx':
-                return self._analyze_pcx(filepath, file_size)
-            else:
-                return None
-                
-        except Exception as e:
-            print(f"Ошибка при анализе файла {filepath}: {e}")
-            return None
-    
-    def _analyze_jpeg(self, filepath: Path, file_size: int) -> Optional[ImageInfo]:
-        try:
-            with Image.open(filepath) as img:
-                width, height = img.size
-                color_depth = img.bits if hasattr(img, 'bits') else 24
-                
-                dpi_value = img.info.get('dpi')
-                if dpi_value:
-                    resolution_x, resolution_y = dpi_value
-                    if resolution_x == 0:
-                        resolution_x = 72
-                    if resolution_y == 0:
-                        resolution_y = 72
-                else:
-                    resolution_x = resolution_y = 72
-                
-                compression = img.info.get('compression', 'JPEG')
-                
-                info = ImageInfo(
-                    filename=filepath.name,
-                    filepath=str(filepath),
-                    file_size=file_size,
-                    width=width,
-                    height=height,
-                    resolution_x=resolution_x,
-                    resolution_y=resolution_y,
-                    color_depth=color_depth,
-                    compression=compression,
-                    format="JPEG"
-                )
-                
-                if HAS_JPEGIO:
-                    try:
-                        jpeg_obj = jpegio.read(str(filepath))
-                        quant_tables = []
-                        for i, table in enumerate(jpeg_obj.quant_tables):
-                            if table is not None:
-                                if HAS_NUMPY:
-                                    table_data = np.array(table).flatten()
-                                    quant_tables.append(f"Table {i}: {table_data[:4].tolist()}...")
-                                else:
-                                    quant_tables.append(f"Table {i}: {len(table)} коэффициентов")
-                        
-                        if quant_tables:
-                            info.additional_info["quantization_tables"] = quant_tables
-                    except:
-                        pass
-                
-                return info
-        except Exception as e:
-            print(f"Ошибка при анализе JPEG {filepath}: {e}")
-        
-        return self._analyze_jpeg_header(filepath, file_size)
-    
-    def _analyze_jpeg_header(self, filepath: Path, file_size: int) -> Optional[ImageInfo]:
-        try:
-            with open(filepath, 'rb') as f:
-                data = f.read(512)
-                
-                pos = 0
-                while pos < len(data) - 1:
-                    if data[pos] == 0xFF and data[pos + 1] == 0xC0:
-                        f.seek(pos + 5)
-                        height = struct.unpack('>H', f.read(2))[0]
-                        width = struct.unpack('>H', f.read(2))[0]
-                        
-                        info = ImageInfo(
-                            filename=filepath.name,
-                            filepath=str(filepath),
-                            file_size=file_size,
-                            width=width,
-                            height=height,
-                            resolution_x=72,
-                            resolution_y=72,
-                            color_depth=24,
-                            compression="JPEG",
-                            format="JPEG"
-                        )
-                        return info
-                    pos += 1
-        except:
-            pass
-        
-        return None
-    
-    def _analyze_gif(self, filepath: Path, file_size: int) -> Optional[ImageInfo]:
-        try:
-            with Image.open(filepath) as img:
-                width, height = img.size
-                
-                has_palette = img.palette is not None
-                palette_colors = 0
-                if has_palette and hasattr(img.palette, 'palette'):
-                    palette_colors = len(img.palette.palette) // 3
-                
-                info = ImageInfo(
-                    filename=filepath.name,
-                    filepath=str(filepath),
-                    file_size=file_size,
-                    width=width,
-                    height=height,
-                    resolution_x=72,
-                    resolution_y=72,
-                    color_depth=8,
-                    compression="LZW",
-                    format="GIF",
-                    has_palette=has_palette,
-                    palette_colors=palette_colors
-                )
-                
-                info.additional_info["has_palette"] = has_palette
-                info.additional_info["palette_colors"] = palette_colors
-                
-                return info
-        except Exception as e:
-            print(f"Ошибка при анализе GIF {filepath}: {e}")
-        
-        try:
-            with open(filepath, 'rb') as f:
-                signature = f.read(6)
-                if signature in [b'GIF87a', b'GIF89a']:
-                    width = struct.unpack('<H', f.read(2))[0]
-                    height = struct.unpack('<H', f.read(2))[0]
-                    
-                    flags = f.read(1)[0]
-                    has_palette = (flags & 0x80) != 0
-                    palette_colors = 2 << (flags & 0x07)
-                    
-                    info = ImageInfo(
-                        filename=filepath.name,
-                        filepath=str(filepath),
-                        file_size=file_size,
-                        width=width,
-                        height=height,
-                        resolution_x=72,
-                        resolution_y=72,
-                        color_depth=8,
-                        compression="LZW",
-                        format="GIF",
-                        has_palette=has_palette,
-                        palette_colors=palette_colors
-                    )
-                    
-                    info.additional_info["has_palette"] = has_palette
-                    info.additional_info["palette_colors"] = palette_colors
-                    
-                    return info
-        except:
-            pass
-        
-        return None
-    
-    def _analyze_bmp(self, filepath: Path, file_size: int) -> Optional[ImageInfo]:
-        try:
-            with Image.open(filepath) as img:
-                width, height = img.size
-                
-                dpi_value = img.info.get('dpi')
-                if dpi_value:
-                    resolution_x, resolution_y = dpi_value
-                    if resolution_x == 0:
-                        resolution_x = 96
-                    if resolution_y == 0:
-                        resolution_y = 96
-                else:
-                    resolution_x = resolution_y = 96
-                
-                color_depth = img.bits if hasattr(img, 'bits') else 24
-                
-                info = ImageInfo(
-                    filename=filepath.name,
-                    filepath=str(filepath),
-                    file_size=file_size,
-                    width=width,
-                    height=height,
-                    resolution_x=resolution_x,
-                    resolution_y=resolution_y,
-                    color_depth=color_depth,
-                    compression="None" if img.mode == 'RGB' else "RLE",
-                    format="BMP"
-                )
-                
-                return info
-        except Exception as e:
-            print(f"Ошибка при анализе BMP {filepath}: {e}")
-        
-        try:
-            with open(filepath, 'rb') as f:
-                if f.read(2) == b'BM':
-                    f.seek(18)
-                    width = struct.unpack('<I', f.read(4))[0]
-                    height = struct.unpack('<I', f.read(4))[0]
-                    
-                    f.seek(28)
-                    color_depth = struct.unpack('<H', f.read(2))[0]
-                    
-                    f.seek(38)
-                    ppm_x = struct.unpack('<I', f.read(4))[0]
-                    ppm_y = struct.unpack('<I', f.read(4))[0]
-                    
-                    dpi_x = ppm_x / 39.3701 if ppm_x > 0 else 96
-                    dpi_y = ppm_y / 39.3701 if ppm_y > 0 else 96
-                    
-                    info = ImageInfo(
-                        filename=filepath.name,
-                        filepath=str(filepath),
-                        file_size=file_size,
-                        width=width,
-                        height=height,
-                        resolution_x=dpi_x,
-                        resolution_y=dpi_y,
-                        color_depth=color_depth,
-                        compression="None",
-                        format="BMP"
-                    )
-                    
-                    return info
-        except:
-            pass
-        
-        return None
-    
-    def _analyze_png(self, filepath: Path, file_size: int) -> Optional[ImageInfo]:
-        try:
-            with Image.open(filepath) as img:
-                width, height = img.size
-                
-                dpi_value = img.info.get('dpi')
-                
-                if dpi_value and dpi_value != (0, 0):
-                    resolution_x, resolution_y = dpi_value
-                else:
-                    resolution_x = None
-                    resolution_y = None
-                
-                color_depth = img.bits if hasattr(img, 'bits') else 24
-                
-                compression = img.info.get('compression', 'DEFLATE')
-                
-                info = ImageInfo(
-                    filename=filepath.name,
-                    filepath=str(filepath),
-                    file_size=file_size,
-                    width=width,
-                    height=height,
-                    resolution_x=resolution_x,
-                    resolution_y=resolution_y,
-                    color_depth=color_depth,
-                    compression=compression,
-                    format="PNG"
-                )
-                
-                if 'gamma' in img.info:
-                    info.additional_info["gamma"] = img.info['gamma']
-                
-                return info
-        except Exception as e:
-            print(f"Ошибка при анализе PNG {filepath}: {e}")
-        
-        return None
-    
-    def _analyze_tiff(self, filepath: Path, file_size: int) -> Optional[ImageInfo]:
-        try:
-            with Image.open(filepath) as img:
-                width, height = img.size
-                
-                dpi_value = img.info.get('dpi')
-                if dpi_value:
-                    resolution_x, resolution_y = dpi_value
-                    if resolution_x == 0:
-                        resolution_x = 72
-                    if resolution_y == 0:
-                        resolution_y = 72
-                else:
-                    resolution_x = resolution_y = 72
-                
-                color_depth = img.bits if hasattr(img, 'bits') else 24
-                
-                compression = img.info.get('compression', 'None')
-                if compression == 'tiff_lzw':
-                    compression = "LZW"
-                elif compression == 'tiff_ccitt':
-                    compression = "CCITT"
-                
-                info = ImageInfo(
-                    filename=filepath.name,
-                    filepath=str(filepath),
-                    file_size=file_size,
-                    width=width,
-                    height=height,
-                    resolution_x=resolution_x,
-                    resolution_y=resolution_y,
-                    color_depth=color_depth,
-                    compression=compression,
-                    format="TIFF"
-                )
-                
-                return info
-        except Exception as e:
-            print(f"Ошибка при анализе TIFF {filepath}: {e}")
-        
-        return None
-    
-    def _analyze_pcx(self, filepath: Path, file_size: int) -> Optional[ImageInfo]:
-        try:
-            with open(filepath, 'rb') as f:
-                manufacturer = f.read(1)[0]
-                if manufacturer != 0x0A:
-                    return None
-                
-                version = f.read(1)[0]
-                encoding = f.read(1)[0]
-                bits_per_pixel = f.read(1)[0]
-                
-                xmin = struct.unpack('<H', f.read(2))[0]
-                ymin = struct.unpack('<H', f.read(2))[0]
-                xmax = struct.unpack('<H', f.read(2))[0]
-                ymax = struct.unpack('<H', f.read(2))[0]
-                
-                width = xmax - xmin + 1
-                height = ymax - ymin + 1
-                
-                hdpi = struct.unpack('<H', f.read(2))[0]
-                vdpi = struct.unpack('<H', f.read(2))[0]
-                
-                resolution_x = hdpi if hdpi > 0 else 96
-                resolution_y = vdpi if vdpi > 0 else 96
-                
-                f.seek(128)
-                
-                compression = "RLE" if encoding == 1 else "None"
-                
-                color_depth = bits_per_pixel
-                
-                info = ImageInfo(
-                    filename=filepath.name,
-                    filepath=str(filepath),
-                    file_size=file_size,
-                    width=width,
-                    height=height,
-                    resolution_x=resolution_x,
-                    resolution_y=resolution_y,
-                    color_depth=color_depth,
-                    compression=compression,
-                    format="PCX"
-                )
-                
-                info.additional_info["pcx_version"] = version
-                
-                return info
-                
-        except Exception as e:
-            print(f"Ошибка при анализе PCX {filepath}: {e}")
-        
-        return None
-    
-    def analyze_folder(self, folder_path: str, max_files: int = 100000, 
-                      use_multithreading: bool = True, progress_callback=None) -> List[ImageInfo]:
-        folder = Path(folder_path)
-        if not folder.exists() or not folder.is_dir():
-            return []
-        
-        image_files = []
-        for ext in self.supported_formats:
-            image_files.extend(folder.glob(f"*{ext}"))
-            image_files.extend(folder.glob(f"*{ext.upper()}"))
-        
-        image_files = image_files[:max_files]
-        
-        start_time = time.time()
-        
-        if use_multithreading and len(image_files) > 10:
-            results = []
-            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-                future_to_file = {executor.submit(self.analyze_file, str(file)): file 
-                                for file in image_files}
-                
-                for i, future in enumerate(concurrent.futures.as_completed(future_to_file)):
-                    result = future.result()
-                    if result:
-                        results.append(result)
-                    
-                    if progress_callback and i % 10 == 0:
-                        progress_callback(i, len(image_files))
-        else:
-            results = []
-            for i, file in enumerate(image_files):
-                result = self.analyze_file(str(file))
-                if result:
-                    results.append(result)
-                
-                if progress_callback and i % 10 == 0:
-                    progress_callback(i, len(image_files))
-        
-        end_time = time.time()
-        self.processing_time = end_time - start_time
-        self.total_files_processed = len(results)
-        
-        if progress_callback:
-            progress_callback(len(image_files), len(image_files))
-        
-        return results
-
-class ImageAnalyzerGUI:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Анализатор графических файлов")
-        self.root.geometry("1200x700")
-        
-        self.analyzer = ImageFileAnalyzer()
-        self.current_results = []
-        
-        self.queue = queue.Queue()
-        
-        self.is_processing = False
-        self.processing_thread = None
-        
-        self.setup_ui()
-        
-        self.check_queue()
-    
-    def setup_ui(self):
-        main_frame = ttk.Frame(self.root, padding="10")
-        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        
-        self.root.columnconfigure(0, weight=1)
-        self.root.rowconfigure(0, weight=1)
-        main_frame.columnconfigure(1, weight=1)
-        main_frame.rowconfigure(3, weight=1)
-        
-        title_label = ttk.Label(
-            main_frame, 
-            text="Анализатор графических файлов", 
-            font=("Arial", 16, "bold")
-        )
-        title_label.grid(row=0, column=0, columnspan=3, pady=(0, 10))
-        
-        control_frame = ttk.LabelFrame(main_frame, text="Управление", padding="10")
-        control_frame.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
-        
-        ttk.Button(
-            control_frame, 
-            text="Выбрать папку", 
-            command=self.select_folder,
-            width=15
-        ).grid(row=0, column=0, padx=(0, 10))
-        
-        ttk.Button(
-            control_frame, 
-            text="Анализировать файл", 
-            command=self.select_file,
-            width=15
-        ).grid(row=0, column=1, padx=(0, 10))
-        
-        self.stop_button = ttk.Button(
-            control_frame, 
-            text="Остановить", 
-            command=self.stop_processing,
-            width=15,
-            state=tk.DISABLED
-        )
-        self.stop_button.grid(row=0, column=2, padx=(0, 10))
-        
-        self.progress_var = tk.DoubleVar()
-        self.progress_bar = ttk.Progressbar(
-            control_frame, 
-            variable=self.progress_var,
-            maximum=100,
-            length=200
-        )
-        self.progress_bar.grid(row=0, column=3, padx=(20, 10))
-        
-        self.status_label = ttk.Label(control_frame, text="Готов к работе")
-        self.status_label.grid(row=0, column=4, padx=(10, 0))
-        
-        settings_frame = ttk.LabelFrame(main_frame, text="Настройки", padding="10")
-        settings_frame.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
-        
-        ttk.Label(settings_frame, text="Макс. файлов:").grid(row=0, column=0, padx=(0, 5))
-        self.max_files_var = tk.StringVar(value="100000")
-        max_files_spinbox = ttk.Spinbox(
-            settings_frame,
-            from_=1,
-            to=100000,
-            textvariable=self.max_files_var,
-            width=10
-        )
-        max_files_spinbox.grid(row=0, column=1, padx=(0, 20))
-        
-        self.multithreading_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(
-            settings_frame,
-            text="Использовать многопоточность",
-            variable=self.multithreading_var
-        ).grid(row=0, column=2, padx=(0, 20))
-        
-        ttk.Label(settings_frame, text="Форматы:").grid(row=0, column=3, padx=(0, 5))
-        formats_text = ", ".join(sorted(self.analyzer.supported_formats))
-        ttk.Label(settings_frame, text=formats_text, foreground="blue").grid(row=0, column=4)
-        
-        results_frame = ttk.LabelFrame(main_frame, text="Результаты", padding="10")
-        results_frame.grid(row=3, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S))
-        results_frame.columnconfigure(0, weight=1)
-        results_frame.rowconfigure(0, weight=1)
-        
-        columns = ("filename", "size", "resolution", "depth", "compression", "format", "filesize")
-        self.tree = ttk.Treeview(results_frame, columns=columns, show="headings", height=15)
-        
-        self.tree.heading("filename", text="Имя файла")
-        self.tree.heading("size", text="Размер (пикс)")
-        self.tree.heading("resolution", text="Разрешение (DPI)")
-        self.tree.heading("depth", text="Глубина цвета")
-        self.tree.heading("compression", text="Сжатие")
-        self.tree.heading("format", text="Формат")
-        self.tree.heading("filesize", text="Размер файла")
-        
-        self.tree.column("filename", width=200)
-        self.tree.column("size", width=100)
-        self.tree.column("resolution", width=120)
-        self.tree.column("depth", width=100)
-        self.tree.column("compression", width=100)
-        self.tree.column("format", width=80)
-        self.tree.column("filesize", width=100)
-        
-        scrollbar_y = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        scrollbar_x = ttk.Scrollbar(results_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
-        self.tree.configure(yscrollcommand=scrollbar_y.set, xscrollcommand=scrollbar_x.set)
-        
-        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        scrollbar_y.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        scrollbar_x.grid(row=1, column=0, sticky=(tk.W, tk.E))
-        
-        self.tree.bind("<Double-1>", self.show_file_details)
-        
-        stats_frame = ttk.Frame(main_frame)
-        stats_frame.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(10, 0))
-        
-        self.total_files_label = ttk.Label(stats_frame, text="Файлов: 0")
-        self.total_files_label.grid(row=0, column=0, padx=(0, 20))
-        
-        self.total_size_label = ttk.Label(stats_frame, text="Общий размер: 0 MB")
-        self.total_size_label.grid(row=0, column=1, padx=(0, 20))
-        
-        self.time_label = ttk.Label(stats_frame, text="Время: 0.00 сек")
-        self.time_label.grid(row=0, column=2, padx=(0, 20))
-        
-        export_frame = ttk.Frame(stats_frame)
-        export_frame.grid(row=0, column=3, sticky=tk.E)
-        
-        ttk.Button(
-            export_frame,
-            text="Экспорт в CSV",
-            command=self.export_csv,
-            width=15
-        ).grid(row=0, column=0, padx=(0, 5))
-        
-        ttk.Button(
-            export_frame,
-            text="Экспорт в TXT",
-            command=self.export_txt,
-            width=15
-        ).grid(row=0, column=1)
-        
-        ttk.Button(
-            export_frame,
-            text="Справка",
-            command=self.show_help,
-            width=15
-        ).grid(row=0, column=2, padx=(5, 0))
-    
-    def select_folder(self):
-        if self.is_processing:
-            messagebox.showwarning("Внимание", "Анализ уже выполняется")
-            return
-        
-        folder_path = filedialog.askdirectory(title="Выберите папку с изображениями")
-        if folder_path:
-            self.start_processing(folder_path)
-    
-    def select_file(self):
-        if self.is_processing:
-            messagebox.showwarning("Внимание", "Анализ уже выполняется")
-            return
-        
-        file_path = filedialog.askopenfilename(
-            title="Выберите файл изображения",
-            filetypes=[
-                ("Все поддерживаемые", "*.jpg;*.jpeg;*.gif;*.tif;*.tiff;*.bmp;*.png;*.pcx"),
-                ("JPEG", "*.jpg;*.jpeg"),
-                ("GIF", "*.gif"),
-                ("TIFF", "*.tif;*.tiff"),
-                ("BMP", "*.bmp"),
-                ("PNG", "*.png"),
-                ("PCX", "*.pcx"),
-                ("Все файлы", "*.*")
-            ]
-        )
-        
-        if file_path:
-            self.start_processing_single(file_path)
-    
-    def start_processing(self, folder_path):
-        self.is_processing = True
-        self.current_results = []
-        self.clear_table()
-        self.update_status("Начинаю анализ...")
-        self.progress_var.set(0)
-        
-        try:
-            max_files = int(self.max_files_var.get())
-        except:
-            max_files = 100000
-        
-        use_threads = self.multithreading_var.get()
-        
-        self.processing_thread = threading.Thread(
-            target=self.process_folder,
-            args=(folder_path, max_files, use_threads),
-            daemon=True
-        )
-        self.processing_thread.start()
-        
-        self.stop_button.configure(state=tk.NORMAL)
-    
-    def start_processing_single(self, file_path):
-        self.is_processing = True
-        self.current_results = []
-        self.clear_table()
-        self.update_status("Анализирую файл...")
-        self.progress_var.set(0)
-        
-        self.processing_thread = threading.Thread(
-            target=self.process_single_file,
-            args=(file_path,),
-            daemon=True
-        )
-        self.processing_thread.start()
-        
-        self.stop_button.configure(state=tk.NORMAL)
-    
-    def process_folder(self, folder_path, max_files, use_threads):
-        try:
-            def progress_callback(current, total):
-                if total > 0:
-                    progress = (current / total) * 100
-                    self.queue.put(("progress", progress))
-                    self.queue.put(("status", f"Обработано {current} из {total} файлов"))
-            
-            results = self.analyzer.analyze_folder(
-                folder_path, 
-                max_files, 
-                use_threads,
-                progress_callback
-            )
-            
-            self.queue.put(("results", results))
-            self.queue.put(("status", f"Анализ завершен. Обработано {len(results)} файлов"))
-            self.queue.put(("progress", 100))
-            
-        except Exception as e:
-            self.queue.put(("error", f"Ошибка при анализе: {str(e)}"))
-        finally:
-            self.queue.put(("finished", None))
-    
-    def process_single_file(self, file_path):
-        try:
-            self.queue.put(("progress", 10))
-            self.queue.put(("status", "Анализирую файл..."))
-            
-            result = self.analyzer.analyze_file(file_path)
-            
-            if result:
-                results = [result]
-                self.queue.put(("results", results))
-                self.queue.put(("status", "Файл успешно проанализирован"))
-            else:
-                self.queue.put(("error", "Не удалось проанализировать файл"))
-            
-            self.queue.put(("progress", 100))
-            
-        except Exception as e:
-            self.queue.put(("error", f"Ошибка при анализе: {str(e)}"))
-        finally:
-            self.queue.put(("finished", None))
-    
-    def stop_processing(self):
-        if self.is_processing:
-            self.is_processing = False
-            self.update_status("Остановка...")
-            messagebox.showinfo("Информация", "Остановка будет выполнена после завершения текущих операций")
-    
-    def check_queue(self):
-        try:
-            while True:
-                msg_type, data = self.queue.get_nowait()
-                
-                if msg_type == "progress":
-                    self.progress_var.set(data)
-                elif msg_type == "status":
-                    self.update_status(data)
-                elif msg_type == "results":
-                    self.display_results(data)
-                elif msg_type == "error":
-                    messagebox.showerror("Ошибка", data)
-                    self.processing_finished()
-                elif msg_type == "finished":
-                    self.processing_finished()
-                
-        except queue.Empty:
-            pass
-        
-        self.root.after(100, self.check_queue)
-    
-    def update_status(self, message):
-        self.status_label.config(text=message)
-        self.root.update_idletasks()
-    
-    def clear_table(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-    
-    def display_results(self, results):
-        self.current_results = results
-        self.clear_table()
-        
-        for info in results:
-            if info.resolution_x is not None and info.resolution_y is not None:
-                resolution = f"{info.resolution_x:.1f}×{info.resolution_y:.1f}"
-            else:
-                resolution = "N/A"
-            
-            size_mb = info.file_size / (1024 * 1024)
-            
-            self.tree.insert("", tk.END, values=(
-                info.filename,
-                f"{info.width}×{info.height}",
-                resolution,
-                f"{info.color_depth} бит",
-                info.compression,
-                info.format,
-                f"{size_mb:.2f} MB"
-            ))
-        
-        total_size = sum(info.file_size for info in results)
-        total_size_mb = total_size / (1024 * 1024)
-        
-        self.total_files_label.config(text=f"Файлов: {len(results)}")
-        self.total_size_label.config(text=f"Общий размер: {total_size_mb:.2f} MB")
-        self.time_label.config(text=f"Время: {self.analyzer.processing_time:.2f} сек")
-    
-    def processing_finished(self):
-        self.is_processing = False
-        self.progress_var.set(0)
-        
-        self.stop_button.configure(state=tk.DISABLED)
-    
-    def show_file_details(self, event):
-        selection = self.tree.selection()
-        if not selection:
-            return
-        
-        item = self.tree.item(selection[0])
-        filename = item['values'][0]
-        
-        for info in self.current_results:
-            if info.filename == filename:
-                self.show_details_window(info)
-                break
-    
-    def show_details_window(self, info):
-        details_window = tk.Toplevel(self.root)
-        details_window.title(f"Детали: {info.filename}")
-        details_window.geometry("600x500")
-        details_window.transient(self.root)
-        details_window.grab_set()
-        
-        main_frame = ttk.Frame(details_window, padding="20")
-        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        
-        details_window.columnconfigure(0, weight=1)
-        details_window.rowconfigure(0, weight=1)
-        main_frame.columnconfigure(1, weight=1)
-        
-        row = 0
-        
-        ttk.Label(main_frame, text="Имя файла:", font=("Arial", 10, "bold")).grid(row=row, column=0, sticky=tk.W, pady=5)
-        ttk.Label(main_frame, text=info.filename).grid(row=row, column=1, sticky=tk.W, pady=5)
-        row += 1
-        
-        ttk.Label(main_frame, text="Путь:", font=("Arial", 10, "bold")).grid(row=row, column=0, sticky=tk.W, pady=5)
-        path_label = ttk.Label(main_frame, text=info.filepath, wraplength=400)
-        path_label.grid(row=row, column=1, sticky=tk.W, pady=5)
-        row += 1
-        
-        ttk.Label(main_frame, text="Размер файла:", font=("Arial", 10, "bold")).grid(row=row, column=0, sticky=tk.W, pady=5)
-        size_mb = info.file_size / (1024 * 1024)
-        ttk.Label(main_frame, text=f"{info.file_size:,} байт ({size_mb:.2f} MB)").grid(row=row, column=1, sticky=tk.W, pady=5)
-        row += 1
-        
-        ttk.Label(main_frame, text="Размер изображения:", font=("Arial", 10, "bold")).grid(row=row, column=0, sticky=tk.W, pady=5)
-        ttk.Label(main_frame, text=f"{info.width} × {info.height} пикселей").grid(row=row, column=1, sticky=tk.W, pady=5)
-        row += 1
-        
-        ttk.Label(main_frame, text="Разрешение:", font=("Arial", 10, "bold")).grid(row=row, column=0, sticky=tk.W, pady=5)
-        if info.resolution_x is not None and info.resolution_y is not None:
-            resolution = f"{info.resolution_x:.1f} × {info.resolution_y:.1f} DPI"
-        else:
-            resolution = "N/A"
-        ttk.Label(main_frame, text=resolution).grid(row=row, column=1, sticky=tk.W, pady=5)
-        row += 1
-        
-        ttk.Label(main_frame, text="Глубина цвета:", font=("Arial", 10, "bold")).grid(row=row, column=0, sticky=tk.W, pady=5)
-        ttk.Label(main_frame, text=f"{info.color_depth} бит").grid(row=row, column=1, sticky=tk.W, pady=5)
-        row += 1
-        
-        ttk.Label(main_frame, text="Сжатие:", font=("Arial", 10, "bold")).grid(row=row, column=0, sticky=tk.W, pady=5)
-        ttk.Label(main_frame, text=info.compression).grid(row=row, column=1, sticky=tk.W, pady=5)
-        row += 1
-        
-        ttk.Label(main_frame, text="Формат:", font=("Arial", 10, "bold")).grid(row=row, column=0, sticky=tk.W, pady=5)
-        ttk.Label(main_frame, text=info.format).grid(row=row, column=1, sticky=tk.W, pady=5)
-        row += 1
-        
-        if info.palette_colors > 0:
-            ttk.Label(main_frame, text="Цвета в палитре:", font=("Arial", 10, "bold")).grid(row=row, column=0, sticky=tk.W, pady=5)
-            ttk.Label(main_frame, text=str(info.palette_colors)).grid(row=row, column=1, sticky=tk.W, pady=5)
-            row += 1
-        
-        if info.additional_info:
-            ttk.Label(main_frame, text="Дополнительная информация:", font=("Arial", 10, "bold")).grid(row=row, column=0, columnspan=2, sticky=tk.W, pady=(10, 5))
-            row += 1
-            
-            for key, value in info.additional_info.items():
-                if isinstance(value, list):
-                    ttk.Label(main_frame, text=f"{key}:", font=("Arial", 9, "bold")).grid(row=row, column=0, sticky=tk.W, pady=2)
-                    for i, item in enumerate(value):
-                        ttk.Label(main_frame, text=f"  {item}").grid(row=row+i, column=1, sticky=tk.W, pady=2)
-                    row += len(value)
-                else:
-                    ttk.Label(main_frame, text=f"{key}:", font=("Arial", 9, "bold")).grid(row=row, column=0, sticky=tk.W, pady=2)
-                    ttk.Label(main_frame, text=str(value)).grid(row=row, column=1, sticky=tk.W, pady=2)
-                    row += 1
-        
-        ttk.Button(main_frame, text="Закрыть", command=details_window.destroy).grid(row=row, column=0, columnspan=2, pady=20)
-    
-    def export_csv(self):
-        if not self.current_results:
-            messagebox.showwarning("Внимание", "Нет данных для экспорта")
-            return
-        
-        file_path = filedialog.asksaveasfilename(
-            defaultextension=".csv",
-            filetypes=[("CSV файлы", "*.csv"), ("Все файлы", "*.*")],
-            initialfile=f"image_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        )
-        
-        if file_path:
-            try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write("Имя файла;Путь;Размер файла (байт);Ширина;Высота;Разрешение X;Разрешение Y;Глубина цвета;Сжатие;Формат;Цвета в палитре\n")
-                    
-                    for info in self.current_results:
-                        f.write(
-                            f"{info.filename};"
-                            f"{info.filepath};"
-                            f"{info.file_size};"
-                            f"{info.width};"
-                            f"{info.height};"
-                            f"{info.resolution_x or 0};"
-                            f"{info.resolution_y or 0};"
-                            f"{info.color_depth};"
-                            f"{info.compression};"
-                            f"{info.format};"
-                            f"{info.palette_colors}\n"
-                        )
-                
-                messagebox.showinfo("Успех", f"Результаты экспортированы в {file_path}")
-            except Exception as e:
-                messagebox.showerror("Ошибка", f"Не удалось сохранить файл: {str(e)}")
-    
-    def export_txt(self):
-        if not self.current_results:
-            messagebox.showwarning("Внимание", "Нет данных для экспорта")
-            return
-        
-        file_path = filedialog.asksaveasfilename(
-            defaultextension=".txt",
-            filetypes=[("Текстовые файлы", "*.txt"), ("Все файлы", "*.*")],
-            initialfile=f"image_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        )
-        
-        if file_path:
-            try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write("=" * 120 + "\n")
-                    f.write(f"{'Имя файла':<30} {'Размер (пикс)':<15} {'Разрешение':<15} {'Глубина цвета':<15} {'Сжатие':<15} {'Формат':<10}\n")
-                    f.write("-" * 120 + "\n")
-                    
-                    for info in self.current_results:
-                        if info.resolution_x is not None and info.resolution_y is not None:
-                            resolution = f"{info.resolution_x:.1f}×{info.resolution_y:.1f}"
-                        else:
-                            resolution = "N/A"
-                        f.write(
-                            f"{info.filename:<30} "
-                            f"{info.width}×{info.height:<12} "
-                            f"{resolution:<15} "
-                            f"{info.color_depth} бит{'':<9} "
-                            f"{info.compression:<15} "
-                            f"{info.format:<10}\n"
-                        )
-                    
-                    f.write("=" * 120 + "\n")
-                    
-                    total_size = sum(info.file_size for info in self.current_results)
-                    f.write(f"\nСтатистика:\n")
-                    f.write(f"Всего файлов: {len(self.current_results)}\n")
-                    f.write(f"Общий размер: {total_size / (1024*1024):.2f} MB\n")
-                    f.write(f"Время обработки: {self.analyzer.processing_time:.2f} сек\n")
-                
-                messagebox.showinfo("Успех", f"Результаты экспортированы в {file_path}")
-            except Exception as e:
-                messagebox.showerror("Ошибка", f"Не удалось сохранить файл: {str(e)}")
-    
-    def show_help(self):
-        help_text = """Анализатор графических файлов
-
-Поддерживаемые форматы:
-• JPEG (.jpg, .jpeg)
-• GIF (.gif)
-• TIFF (.tif, .tiff)
-• BMP (.bmp)
-• PNG (.png)
-• PCX (.pcx)
-
-Функции:
-1. Анализ папки - обработка всех графических файлов в выбранной папке
-2. Анализ одного файла - детальный анализ выбранного файла
-3. Экспорт результатов - сохранение в CSV или TXT формате
-4. Детальная информация - двойной клик по файлу в таблице
-
-Настройки:
-• Максимальное количество файлов - ограничение для анализа папки
-• Многопоточность - ускорение обработки больших папок
-
-Требования:
-• Установленный Python 3.7+
-• Библиотека Pillow (установка: pip install Pillow)
-• Опционально: numpy, jpegio для расширенной функциональности"""
-        
-        messagebox.showinfo("Справка", help_text)
-
-def main():
-    try:
-        root = tk.Tk()
-        app = ImageAnalyzerGUI(root)
-        root.mainloop()
-    except Exception as e:
-        print(f"Ошибка запуска приложения: {e}")
-        messagebox.showerror("Критическая ошибка", str(e))
-
-if __name__ == "__main__":
-    try:
-        from PIL import Image
-        HAS_PIL = True
-    except ImportError:
-        messagebox.showerror("Ошибка", "Не установлена библиотека Pillow\nУстановите: pip install Pillow")
-        sys.exit(1)
-    
+﻿import os
+import math
+import array
+import sys
+import time
+import json
+import struct
+import hashlib
+import numbers
+import sqlite3
+import fnmatch
+import threading
+import queue
+import asyncio
+from pathlib import Path
+from datetime import datetime
+from dataclasses import dataclass, fields
+from typing import List, Dict, Optional, Tuple, Iterator, AsyncIterator
+import concurrent.futures
+from itertools import islice
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter.font import Font
+from PIL import Image, ImageTk
+
+try:
+    import jpegio
+    HAS_JPEGIO = True
+except ImportError:
+    HAS_JPEGIO = False
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+@dataclass
+class ImageInfo:
+    filename: str
+    filepath: str
+    file_size: int
+    width: int
+    height: int
+    resolution_x: Optional[float] = None
+    resolution_y: Optional[float] = None
+    color_depth: int = 0
+    compression: str = "Unknown"
+    format: str = "Unknown"
+    has_palette: bool = False
+    palette_colors: int = 0
+    additional_info: Dict = None
+    
+    def __post_init__(self):
+        if self.additional_info is None:
+            self.additional_info = {}
+
+class ImageInfoRow:
+    __slots__ = ("_table", "_index")
+    
+    def __init__(self, table: "ImageInfoTable", index: int):
+        self._table = table
+        self._index = index
+    
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self._table._value(self._index, name)
+    
+    def __reduce__(self):
+        return ImageInfo, tuple(self._table._value(self._index, field.name) for field in fields(ImageInfo))
+    
+    def __repr__(self):
+        return f"ImageInfoRow({self._index}, {self.filepath!r})"
+    
+    def to_info(self) -> ImageInfo:
+        return ImageInfo(*(self._table._value(self._index, field.name) for field in fields(ImageInfo)))
+
+class ImageInfoTable:
+    NUMERIC_COLUMNS = {
+        "file_size": "q", "width": "q", "height": "q", "resolution_x": "d", "resolution_y": "d",
+        "color_depth": "q", "has_palette": "b", "palette_colors": "q"
+    }
+    STRING_COLUMNS = ("format", "compression")
+    
+    def __init__(self, infos=None):
+        self._names = []
+        self._directories = []
+        self._directory_codes = {}
+        self._directory_column = array.array("I")
+        self._columns = {name: array.array(code) for name, code in self.NUMERIC_COLUMNS.items()}
+        self._strings = {name: [] for name in self.STRING_COLUMNS}
+        self._string_codes = {name: {} for name in self.STRING_COLUMNS}
+        self._string_columns = {name: array.array("I") for name in self.STRING_COLUMNS}
+        self._extras = [{}]
+        self._extra_codes = {(): 0}
+        self._extra_column = array.array("i")
+        self._unhashable_extras = {}
+        
+        if infos is not None:
+            self.extend(infos)
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    def __iter__(self) -> Iterator[ImageInfoRow]:
+        for index in range(len(self._names)):
+            yield ImageInfoRow(self, index)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(*index.indices(len(self._names))))
+        if index < 0:
+            index += len(self._names)
+        if not 0 <= index < len(self._names):
+            raise IndexError("ImageInfoTable index out of range")
+        return ImageInfoRow(self, index)
+    
+    @staticmethod
+    def _intern(values: List, codes: Dict, value) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
+    
+    def append(self, info: ImageInfo):
+        filepath = info.filepath
+        name = info.filename if filepath.endswith(info.filename) else filepath
+        directory = filepath[:len(filepath) - len(name)]
+        
+        self._names.append(name)
+        code = self._directory_codes.get(directory)
+        if code is None:
+            code = self._intern(self._directories, self._directory_codes, directory)
+        self._directory_column.append(code)
+        
+        columns = self._columns
+        columns["file_size"].append(info.file_size)
+        columns["width"].append(info.width)
+        columns["height"].append(info.height)
+        columns["resolution_x"].append(math.nan if info.resolution_x is None else info.resolution_x)
+        columns["resolution_y"].append(math.nan if info.resolution_y is None else info.resolution_y)
+        columns["color_depth"].append(info.color_depth)
+        columns["has_palette"].append(bool(info.has_palette))
+        columns["palette_colors"].append(info.palette_colors)
+        
+        for column, values in self._string_columns.items():
+            values.append(self._intern(self._strings[column], self._string_codes[column], getattr(info, column)))
+        
+        extra = info.additional_info
+        if not extra:
+            self._extra_column.append(0)
+            return
+        
+        try:
+            key = tuple(sorted(extra.items()))
+            code = self._extra_codes.get(key)
+        except TypeError:
+            code = -1
+            self._unhashable_extras[len(self._names) - 1] = dict(extra)
+        else:
+            if code is None:
+                code = self._extra_codes[key] = len(self._extras)
+                self._extras.append(dict(extra))
+        self._extra_column.append(code)
+    
+    def extend(self, infos):
+        for info in infos:
+            self.append(info.to_info() if isinstance(info, ImageInfoRow) else info)
+    
+    def _value(self, index: int, name: str):
+        if name == "filename":
+            return self._names[index]
+        if name == "filepath":
+            return self._directories[self._directory_column[index]] + self._names[index]
+        if name in self._string_columns:
+            return self._strings[name][self._string_columns[name][index]]
+        if name == "additional_info":
+            code = self._extra_column[index]
+            return dict(self._extras[code] if code >= 0 else self._unhashable_extras[index])
+        if name == "has_palette":
+            return bool(self._columns[name][index])
+        if name in self._columns:
+            value = self._columns[name][index]
+            return None if value != value else value
+        raise AttributeError(name)
+    
+    def to_infos(self) -> List[ImageInfo]:
+        return [row.to_info() for row in self]
+    
+    def _keys(self, name: str):
+        if name in self._columns:
+            values = self._columns[name]
+            return np.frombuffer(values, dtype=values.typecode) if HAS_NUMPY else values
+        if name in self._string_columns:
+            codes = self._string_columns[name]
+            return np.frombuffer(codes, dtype=np.uint32) if HAS_NUMPY else codes
+        if name in ("filename", "filepath"):
+            return [self._value(index, name) for index in range(len(self))]
+        raise KeyError(f"Неизвестный столбец '{name}'")
+    
+    def column(self, name: str):
+        if name in self._string_columns:
+            strings = self._strings[name]
+            return [strings[code] for code in self._string_columns[name]]
+        if name in self._columns and HAS_NUMPY:
+            return np.array(self._keys(name))
+        return list(self._keys(name))
+    
+    @staticmethod
+    def _take_array(values: array.array, indices) -> array.array:
+        if not HAS_NUMPY:
+            return array.array(values.typecode, (values[index] for index in indices))
+        
+        result = array.array(values.typecode)
+        result.frombytes(np.frombuffer(values, dtype=values.typecode)[indices].tobytes())
+        return result
+    
+    def take(self, indices) -> "ImageInfoTable":
+        if HAS_NUMPY:
+            indices = np.asarray(indices, dtype=np.intp)
+            positions = indices.tolist()
+        else:
+            positions = list(indices)
+        
+        table = ImageInfoTable()
+        names = self._names
+        table._names = [names[index] for index in positions]
+        table._directories = list(self._directories)
+        table._directory_codes = dict(self._directory_codes)
+        table._directory_column = self._take_array(self._directory_column, indices)
+        for name, values in self._columns.items():
+            table._columns[name] = self._take_array(values, indices)
+        for name, values in self._string_columns.items():
+            table._strings[name] = list(self._strings[name])
+            table._string_codes[name] = dict(self._string_codes[name])
+            table._string_columns[name] = self._take_array(values, indices)
+        table._extras = list(self._extras)
+        table._extra_codes = dict(self._extra_codes)
+        table._extra_column = self._take_array(self._extra_column, indices)
+        table._unhashable_extras = {position: self._unhashable_extras[index]
+                                    for position, index in enumerate(positions) if index in self._unhashable_extras}
+        return table
+    
+    def _condition(self, name: str, value):
+        bound = None
+        if name.startswith(("min_", "max_")) and name[4:] in self._columns:
+            bound, name = name[:3], name[4:]
+        
+        keys = self._keys(name)
+        if name in self._string_columns:
+            value = self._string_codes[name].get(value, -1)
+        
+        if bound == "min":
+            return keys, lambda key: key >= value
+        if bound == "max":
+            return keys, lambda key: key <= value
+        return keys, lambda key: key == value
+    
+    def filter(self, predicate=None, **conditions) -> "ImageInfoTable":
+        checks = [self._condition(name, value) for name, value in conditions.items()]
+        
+        if HAS_NUMPY:
+            mask = np.ones(len(self), dtype=bool)
+            for keys, check in checks:
+                mask &= check(np.asarray(keys))
+            indices = np.flatnonzero(mask)
+        else:
+            indices = [index for index in range(len(self)) if all(check(keys[index]) for keys, check in checks)]
+        
+        if predicate is not None:
+            indices = [index for index in list(indices) if predicate(ImageInfoRow(self, int(index)))]
+        return self.take(indices)
+    
+    def _sort_keys(self, name: str):
+        keys = self._keys(name)
+        if name not in self._string_columns:
+            return keys
+        
+        strings = self._strings[name]
+        ranks = [0] * len(strings)
+        for rank, code in enumerate(sorted(range(len(strings)), key=strings.__getitem__)):
+            ranks[code] = rank
+        return np.array(ranks, dtype=np.int64)[keys] if HAS_NUMPY else [ranks[code] for code in keys]
+    
+    def sort(self, by: str = "filename", reverse: bool = False) -> "ImageInfoTable":
+        keys = self._sort_keys(by)
+        
+        if isinstance(keys, list) and (not keys or isinstance(keys[0], str)):
+            indices = sorted(range(len(self)), key=keys.__getitem__, reverse=reverse)
+        elif HAS_NUMPY:
+            keys = np.asarray(keys, dtype=np.float64)
+            indices = np.argsort(-keys if reverse else keys, kind="stable")
+        else:
+            sign = -1 if reverse else 1
+            indices = sorted(range(len(self)), key=lambda index: (math.isnan(keys[index]), sign * keys[index]))
+        
+        return self.take(indices)
+    
+    def aggregate(self, by: str = "format", column: str = "file_size") -> Dict:
+        groups = self._keys(by)
+        values = self._keys(column)
+        labels = self._strings.get(by)
+        
+        if HAS_NUMPY and not isinstance(groups, list):
+            values = np.asarray(values, dtype=np.float64)
+            unique, inverse = np.unique(groups, return_inverse=True)
+            counts = np.bincount(inverse, minlength=len(unique))
+            totals = np.bincount(inverse, weights=values, minlength=len(unique))
+            minimums = np.full(len(unique), np.inf)
+            maximums = np.full(len(unique), -np.inf)
+            np.minimum.at(minimums, inverse, values)
+            np.maximum.at(maximums, inverse, values)
+            rows = zip(unique.tolist(), counts.tolist(), totals.tolist(), minimums.tolist(), maximums.tolist())
+        else:
+            summary = {}
+            for group, value in zip(groups, values):
+                entry = summary.get(group)
+                if entry is None:
+                    summary[group] = [1, value, value, value]
+                else:
+                    entry[0] += 1
+                    entry[1] += value
+                    entry[2] = min(entry[2], value)
+                    entry[3] = max(entry[3], value)
+            rows = ((group, *entry) for group, entry in summary.items())
+        
+        integral = column in self._columns and self._columns[column].typecode != "d"
+        result = {}
+        for group, count, total, minimum, maximum in rows:
+            key = labels[int(group)] if labels is not None else group
+            if integral:
+                total, minimum, maximum = int(total), int(minimum), int(maximum)
+            result[key] = {"files": count, "total": total, "min": minimum, "max": maximum, "mean": total / count}
+        return result
+
+class MetadataCache:
+    QUERY_BATCH = 500
+    
+    def __init__(self, path: str, max_entries: int = 1000000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        
+        self._lock = threading.Lock()
+        self._pending = {}
+        
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, inode INTEGER, "
+            "info TEXT, last_used INTEGER)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS files_last_used ON files (last_used)")
+        self._connection.commit()
+        
+        self._count = self._connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+    
+    @staticmethod
+    def _json_default(value):
+        if isinstance(value, numbers.Real):
+            return float(value)
+        return str(value)
+    
+    def _fetch(self, keys: List[str]) -> Dict:
+        rows = {}
+        for start in range(0, len(keys), self.QUERY_BATCH):
+            batch = keys[start:start + self.QUERY_BATCH]
+            placeholders = ", ".join("?" * len(batch))
+            for row in self._connection.execute(
+                    f"SELECT path, size, mtime_ns, inode, info FROM files WHERE path IN ({placeholders})", batch):
+                rows[row[0]] = row
+        return rows
+    
+    def lookup(self, filepaths: List[str]) -> Tuple[List[ImageInfo], List[str]]:
+        entries = []
+        for filepath in filepaths:
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                continue
+            entries.append((filepath, os.path.abspath(filepath), (stat.st_size, stat.st_mtime_ns, stat.st_ino)))
+        
+        hits = []
+        misses = []
+        touched = []
+        now = time.time_ns()
+        
+        with self._lock:
+            rows = self._fetch([key for _, key, _ in entries])
+            
+            for filepath, key, signature in entries:
+                row = rows.get(key)
+                if row is not None and row[1:4] == signature:
+                    hits.append(ImageInfo(*json.loads(row[4])))
+                    touched.append((now, key))
+                    continue
+                
+                if row is not None:
+                    self.invalidations += 1
+                self._pending[str(Path(filepath))] = (key, signature, row is not None)
+                misses.append(filepath)
+            
+            if touched:
+                self._connection.executemany("UPDATE files SET last_used = ? WHERE path = ?", touched)
+                self._connection.commit()
+            
+            self.hits += len(hits)
+            self.misses += len(misses)
+        
+        return hits, misses
+    
+    def store(self, filepaths: List[str], results: List[ImageInfo]):
+        now = time.time_ns()
+        with self._lock:
+            rows = []
+            for info in results:
+                pending = self._pending.get(info.filepath)
+                if pending is None:
+                    continue
+                key, signature, existed = pending
+                values = [getattr(info, field.name) for field in fields(ImageInfo)]
+                rows.append((key, *signature, json.dumps(values, default=self._json_default), now))
+                if not existed:
+                    self._count += 1
+            
+            for filepath in filepaths:
+                self._pending.pop(str(Path(filepath)), None)
+            
+            if rows:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO files (path, size, mtime_ns, inode, info, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+            
+            excess = self._count - self.max_entries if self.max_entries is not None else 0
+            if excess > 0:
+                self._connection.execute(
+                    "DELETE FROM files WHERE path IN (SELECT path FROM files ORDER BY last_used LIMIT ?)",
+                    (excess,)
+                )
+                self._count -= excess
+                self.evictions += excess
+            
+            self._connection.commit()
+    
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            'entries': self._count,
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+    
+    def reset_stats(self):
+        self.hits = self.misses = self.invalidations = self.evictions = 0
+    
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM files")
+            self._connection.commit()
+            self._count = 0
+            self._pending.clear()
+    
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+@dataclass
+class ScanDelta:
+    added: List[ImageInfo]
+    modified: List[ImageInfo]
+    removed: List[ImageInfo]
+    unchanged: List[ImageInfo]
+    unreadable: List[ImageInfo]
+    complete: bool = True
+    
+    @property
+    def changed(self) -> List[ImageInfo]:
+        return self.added + self.modified + self.unreadable + self.removed
+    
+    @property
+    def merged(self) -> List[ImageInfo]:
+        return self.unchanged + self.added + self.modified
+
+class ScanManifest(MetadataCache):
+    def __init__(self, path: str):
+        super().__init__(path, max_entries=None)
+        self.scan_started = None
+        self.added = []
+        self.modified = []
+        self.unchanged = []
+        self.unreadable = []
+    
+    def begin(self):
+        with self._lock:
+            self.scan_started = time.time_ns()
+            self.added = []
+            self.modified = []
+            self.unchanged = []
+            self.unreadable = []
+            self._pending.clear()
+        self.reset_stats()
+    
+    def lookup(self, filepaths: List[str]) -> Tuple[List[ImageInfo], List[str]]:
+        hits, misses = super().lookup(filepaths)
+        with self._lock:
+            self.unchanged.extend(hits)
+        return hits, misses
+    
+    def store(self, filepaths: List[str], results: List[ImageInfo]):
+        with self._lock:
+            for info in results:
+                pending = self._pending.get(info.filepath)
+                if pending is not None:
+                    (self.modified if pending[2] else self.added).append(info)
+            
+            analyzed = {info.filepath for info in results}
+            failed = []
+            for filepath in filepaths:
+                pending = self._pending.get(str(Path(filepath)))
+                if pending is not None and pending[2] and str(Path(filepath)) not in analyzed:
+                    failed.append(pending[0])
+            
+            if failed:
+                now = time.time_ns()
+                rows = self._fetch(failed)
+                self.unreadable.extend(ImageInfo(*json.loads(rows[key][4])) for key in failed if key in rows)
+                self._connection.executemany("UPDATE files SET last_used = ? WHERE path = ?",
+                                             [(now, key) for key in failed])
+        super().store(filepaths, results)
+    
+    def finish(self, complete: bool = True, in_scope=None) -> ScanDelta:
+        if self.scan_started is None:
+            raise RuntimeError("begin() must be called before finish()")
+        
+        removed = []
+        with self._lock:
+            if complete:
+                rows = self._connection.execute(
+                    "SELECT path, info FROM files WHERE last_used < ?", (self.scan_started,)).fetchall()
+                rows = [row for row in rows if in_scope is None or in_scope(row[0])]
+                removed = [ImageInfo(*json.loads(row[1])) for row in rows]
+                self._connection.executemany("DELETE FROM files WHERE path = ?", [(row[0],) for row in rows])
+                self._count -= len(removed)
+            self._connection.commit()
+            self.scan_started = None
+        
+        return ScanDelta(self.added, self.modified, removed, self.unchanged, self.unreadable, complete)
+
+class HeaderBuffer:
+    def __init__(self, f, block_size: int = 4096):
+        self.file = f
+        self.block_size = block_size
+        self.offset = 0
+        self.data = f.read(block_size)
+    
+    def _window(self, offset: int, size: int) -> int:
+        start = offset - self.offset
+        if 0 <= start and (start + size <= len(self.data) or len(self.data) < self.block_size):
+            return start
+        
+        self.file.seek(offset)
+        self.data = self.file.read(max(size, self.block_size))
+        self.offset = offset
+        return 0
+    
+    def read(self, offset: int, size: int) -> bytes:
+        start = self._window(offset, size)
+        return self.data[start:start + size]
+    
+    def unpack(self, fmt: str, offset: int) -> Tuple:
+        start = self._window(offset, struct.calcsize(fmt))
+        return struct.unpack_from(fmt, self.data, start)
+
+class ImageFileAnalyzer:
+    HEADER_BYTES = 4096
+    
+    BACKENDS = ("thread", "process", "serial")
+    
+    JPEG_PROCESSES = {
+        0xC0: "Baseline", 0xC1: "Extended sequential", 0xC2: "Progressive", 0xC3: "Lossless",
+        0xC5: "Differential sequential", 0xC6: "Differential progressive", 0xC7: "Differential lossless",
+        0xC9: "Extended sequential, arithmetic", 0xCA: "Progressive, arithmetic", 0xCB: "Lossless, arithmetic",
+        0xCD: "Differential sequential, arithmetic", 0xCE: "Differential progressive, arithmetic",
+        0xCF: "Differential lossless, arithmetic"
+    }
+    
+    PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+    
+    BMP_COMPRESSION = {0: "None", 1: "RLE8", 2: "RLE4", 3: "Bitfields", 4: "JPEG", 5: "PNG", 6: "Bitfields"}
+    
+    TIFF_FIELD_TYPES = {1: 'B', 3: 'H', 4: 'I', 5: 'II'}
+    TIFF_TAGS = frozenset({256, 257, 258, 259, 262, 277, 282, 283, 296})
+    TIFF_COMPRESSION = {
+        1: "None", 2: "CCITT", 3: "CCITT G3", 4: "CCITT G4", 5: "LZW", 6: "JPEG", 7: "JPEG",
+        8: "Deflate", 32773: "PackBits", 32946: "Deflate"
+    }
+    
+    def __init__(self):
+        self.supported_formats = {'.jpg', '.jpeg', '.gif', '.tif', '.tiff', '.bmp', '.png', '.pcx'}
+        self.total_files_processed = 0
+        self.processing_time = 0
+        self.discovery_truncated = False
+        self.unlisted_directories = []
+        
+    def analyze_file(self, filepath: str) -> Optional[ImageInfo]:
+        try:
+            filepath = Path(filepath)
+            try:
+                file_size = filepath.stat().st_size
+            except FileNotFoundError:
+                return None
+            
+            extension = filepath.suffix.lower()
+            
+            if extension in ['.jpg', '.jpeg']:
+                return self._analyze_jpeg(filepath, file_size)
+            elif extension == '.gif':
+                return self._analyze_gif(filepath, file_size)
+            elif extension in ['.tif', '.tiff']:
+                return self._analyze_tiff(filepath, file_size)
+            elif extension == '.bmp':
+                return self._analyze_bmp(filepath, file_size)
+            elif extension == '.png':
+                return self._analyze_png(filepath, file_size)
+            elif extension == '.pcx':
+                return self._analyze_pcx(filepath, file_size)
+            else:
+                return None
+                
+        except Exception as e:
+            print(f"Ошибка при анализе файла {filepath}: {e}")
+            return None
+    
+    def _read_jpeg_header(self, filepath: Path, file_size: int) -> Optional[ImageInfo]:
+        with open(filepath, 'rb', buffering=0) as f:
+            header = HeaderBuffer(f, self.HEADER_BYTES)
+            if header.read(0, 2) != b'\xff\xd8':
+                return None
+            
+            jfif_resolution = exif_resolution = None
+            offset = 2
+            while True:
+                segment = header.read(offset, 4)
+                if len(segment) < 4 or segment[0] != 0xFF:
+                    return None
+                
+                marker = segment[1]
+                if marker == 0xFF:
+                    offset += 1
+                    continue
+                if marker in (0xD9, 0xDA):
+                    return None
+                
+                length = struct.unpack_from('>H', segment, 2)[0]
+                start = offset + 4
+                
+                if marker in self.JPEG_PROCESSES:
+                    precision, height, width, components = header.unpack('>BHHB', start)
+                    resolution_x, resolution_y = jfif_resolution or exif_resolution or (72, 72)
+                    
+                    info = ImageInfo(
+                        filename=filepath.name,
+                        filepath=str(filepath),
+                        file_size=file_size,
+                        width=width,
+                        height=height,
+                        resolution_x=resolution_x,
+                        resolution_y=resolution_y,
+                        color_depth=precision * components,
+                        compression="JPEG",
+                        format="JPEG"
+                    )
+                    
+                    info.additional_info["jpeg_process"] = self.JPEG_PROCESSES[marker]
+                    
+                    return info
+                
+                if marker == 0xE0 and jfif_resolution is None:
+                    data = header.read(start, min(length - 2, 12))
+                    if data[:5] == b'JFIF\x00' and len(data) == 12:
+                        units, density_x, density_y = struct.unpack_from('>BHH', data, 7)
+                        scale = {1: 1, 2: 2.54}.get(units)
+                        if scale and density_x and density_y:
+                            jfif_resolution = (density_x * scale, density_y * scale)
+                
+                elif marker == 0xE1 and exif_resolution is None:
+                    if header.read(start, 6) == b'Exif\x00\x00':
+                        tags = self._read_tiff_tags(header, start + 6)
+                        if tags:
+                            exif_resolution = self._tiff_resolution(tags)
+                
+                offset = start + length - 2
+    
+    def _add_quantization_tables(self, filepath: Path, info: ImageInfo):
+        try:
+            jpeg_obj = jpegio.read(str(filepath))
+            quant_tables = []
+            for i, table in enumerate(jpeg_obj.quant_tables):
+                if table is not None:
+                    if HAS_NUMPY:
+                        table_data = np.array(table).flatten()
+                        quant_tables.append(f"Table {i}: {table_data[:4].tolist()}...")
+                    else:
+                        quant_tables.append(f"Table {i}: {len(table)} коэффициентов")
+            
+            if quant_tables:
+                info.additional_info["quantization_tables"] = quant_tables
+        except:
+            pass
+    
+    def _analyze_jpeg(self, filepath: Path, file_size: int) -> Optional[ImageInfo]:
+        try:
+            info = self._read_jpeg_header(filepath, file_size)
+            if info:
+                if HAS_JPEGIO:
+                    self._add_quantization_tables(filepath, info)
+                return info
+        except (OSError, struct.error):
+            pass
+        
+        try:
+            with Image.open(filepath) as img:
+                width, height = img.size
+                color_depth = img.bits if hasattr(img, 'bits') else 24
+                
+                dpi_value = img.info.get('dpi')
+                if dpi_value:
+                    resolution_x, resolution_y = dpi_value
+                    if resolution_x == 0:
+                        resolution_x = 72
+                    if resolution_y == 0:
+                        resolution_y = 72
+                else:
+                    resolution_x = resolution_y = 72
+                
+                compression = img.info.get('compression', 'JPEG')
+                
+                info = ImageInfo(
+                    filename=filepath.name,
+                    filepath=str(filepath),
+                    file_size=file_size,
+                    width=width,
+                    height=height,
+                    resolution_x=resolution_x,
+                    resolution_y=resolution_y,
+                    color_depth=color_depth,
+                    compression=compression,
+                    format="JPEG"
+                )
+                
+                if HAS_JPEGIO:
+                    self._add_quantization_tables(filepath, info)
+                
+                return info
+        except Exception as e:
+            print(f"Ошибка при анализе JPEG {filepath}: {e}")
+        
+        return None
+    
+    def _read_gif_header(self, filepath: Path, file_size: int) -> Optional[ImageInfo]:
+        with open(filepath, 'rb', buffering=0) as f:
+            data = f.read(13)
+        
+        if len(data) < 13 or data[:6] not in (b'GIF87a', b'GIF89a'):
+            return None
+        
+        width, height, flags = struct.unpack_from('<HHB', data, 6)
+        has_palette = (flags & 0x80) != 0
+        palette_colors = 2 << (flags & 0x07) if has_palette else 0
+        
+        info = ImageInfo(
+            filename=filepath.name,
+            filepath=str(filepath),
+            file_size=file_size,
+            width=width,
+            height=height,
+            resolution_x=72,
+            resolution_y=72,
+            color_depth=8,
+            compression="LZW",
+            format="GIF",
+            has_palette=has_palette,
+            palette_colors=palette_colors
+        )
+        
+        info.additional_info["has_palette"] = has_palette
+        info.additional_info["palette_colors"] = palette_colors
+        
+        return info
+    
+    def _analyze_gif(self, filepath: Path, file_size: int) -> Optional[ImageInfo]:
+        try:
+            info = self._read_gif_header(filepath, file_size)
+            if info:
+                return info
+        except (OSError, struct.error):
+            pass
+        
+        try:
+            with Image.open(filepath) as img:
+                width, height = img.size
+                
+                has_palette = img.palette is not None
+                palette_colors = 0
+                if has_palette and hasattr(img.palette, 'palette'):
+                    palette_colors = len(img.palette.palette) // 3
+                
+                info = ImageInfo(
+                    filename=filepath.name,
+                    filepath=str(filepath),
+                    file_size=file_size,
+                    width=width,
+                    height=height,
+                    resolution_x=72,
+                    resolution_y=72,
+                    color_depth=8,
+                    compression="LZW",
+                    format="GIF",
+                    has_palette=has_palette,
+                    palette_colors=palette_colors
+                )
+                
+                info.additional_info["has_palette"] = has_palette
+                info.additional_info["palette_colors"] = palette_colors
+                
+                return info
+        except Exception as e:
+            print(f"Ошибка при анализе GIF {filepath}: {e}")
+        
+        return None
+    
+    def _read_bmp_header(self, filepath: Path, file_size: int) -> Optional[ImageInfo]:
+        with open(filepath, 'rb', buffering=0) as f:
+            data = f.read(54)
+        
+        if len(data) < 26 or data[:2] != b'BM':
+            return None
+        
+        header_size = struct.unpack_from('<I', data, 14)[0]
+        if header_size == 12:
+            width, height, planes, color_depth = struct.unpack_from('<HHHH', data, 18)
+            compression = colors_used = ppm_x = ppm_y = 0
+        elif header_size >= 40 and len(data) >= 54:
+            (width, height, planes, color_depth, compression,
+             image_size, ppm_x, ppm_y, colors_used) = struct.unpack_from('<iiHHIIiiI', data, 18)
+        else:
+            return None
+        
+        has_palette = color_depth <= 8
+        palette_colors = (colors_used or 1 << color_depth) if has_palette else 0
+        
+        return ImageInfo(
+            filename=filepath.name,
+            filepath=str(filepath),
+            file_size=file_size,
+            width=abs(width),
+            height=abs(height),
+            resolution_x=ppm_x / 39.3701 if ppm_x > 0 else 96,
+            resolution_y=ppm_y / 39.3701 if ppm_y > 0 else 96,
+            color_depth=color_depth,
+            compression=self.BMP_COMPRESSION.get(compression, f"Unknown ({compression})"),
+            format="BMP",
+            has_palette=has_palette,
+            palette_colors=palette_colors
+        )
+    
+    def _analyze_bmp(self, filepath: Path, file_size: int) -> Optional[ImageInfo]:
+        try:
+            info = self._read_bmp_header(filepath, file_size)
+            if info:
+                return info
+        except (OSError, struct.error):
+            pass
+        
+        try:
+            with Image.open(filepath) as img:
+                width, height = img.size
+                
+                dpi_value = img.info.get('dpi')
+                if dpi_value:
+                    resolution_x, resolution_y = dpi_value
+                    if resolution_x == 0:
+                        resolution_x = 96
+                    if resolution_y == 0:
+                        resolution_y = 96
+                else:
+                    resolution_x = resolution_y = 96
+                
+                color_depth = img.bits if hasattr(img, 'bits') else 24
+                
+                info = ImageInfo(
+                    filename=filepath.name,
+                    filepath=str(filepath),
+                    file_size=file_size,
+                    width=width,
+                    height=height,
+                    resolution_x=resolution_x,
+                    resolution_y=resolution_y,
+                    color_depth=color_depth,
+                    compression="None" if img.mode == 'RGB' else "RLE",
+                    format="BMP"
+                )
+                
+                return info
+        except Exception as e:
+            print(f"Ошибка при анализе BMP {filepath}: {e}")
+        
+        return None
+    
+    def _read_png_header(self, filepath: Path, file_size: int) -> Optional[ImageInfo]:
+        with open(filepath, 'rb', buffering=0) as f:
+            header_buffer = HeaderBuffer(f, self.HEADER_BYTES)
+            if header_buffer.read(0, 8) != b'\x89PNG\r\n\x1a\n':
+                return None
+            
+            header = None
+            resolution_x = resolution_y = None
+            gamma = None
+            palette_colors = 0
+            offset = 8
+            
+            while True:
+                chunk = header_buffer.read(offset, 8)
+                if len(chunk) < 8:
+                    break
+                
+                length, chunk_type = struct.unpack('>I4s', chunk)
+                if chunk_type in (b'IDAT', b'IEND'):
+                    break
+                
+                if chunk_type not in (b'IHDR', b'pHYs', b'gAMA'):
+                    if chunk_type == b'PLTE':
+                        palette_colors = length // 3
+                    offset += length + 12
+                    continue
+                
+                data = header_buffer.read(offset + 8, min(length, 64))
+                offset += length + 12
+                
+                if chunk_type == b'IHDR':
+                    header = struct.unpack_from('>IIBBBBB', data)
+                elif chunk_type == b'pHYs':
+                    ppu_x, ppu_y, unit = struct.unpack_from('>IIB', data)
+                    if unit == 1 and ppu_x and ppu_y:
+                        resolution_x = ppu_x * 0.0254
+                        resolution_y = ppu_y * 0.0254
+                else:
+                    gamma = struct.unpack_from('>I', data)[0] / 100000
+        
+        if header is None:
+            return None
+        
+        width, height, bit_depth, color_type = header[:4]
+        channels = self.PNG_CHANNELS.get(color_type)
+        if channels is None:
+            return None
+        
+        info = ImageInfo(
+            filename=filepath.name,
+            filepath=str(filepath),
+            file_size=file_size,
+            width=width,
+            height=height,
+            resolution_x=resolution_x,
+            resolution_y=resolution_y,
+            color_depth=bit_depth * channels,
+            compression="DEFLATE",
+            format="PNG",
+            has_palette=color_type == 3,
+            palette_colors=palette_colors
+        )
+        
+        if gamma is not None:
+            info.additional_info["gamma"] = gamma
+        
+        return info
+    
+    def _analyze_png(self, filepath: Path, file_size: int) -> Optional[ImageInfo]:
+        try:
+            info = self._read_png_header(filepath, file_size)
+            if info:
+                return info
+        except (OSError, struct.error):
+            pass
+        
+        try:
+            with Image.open(filepath) as img:
+                width, height = img.size
+                
+                dpi_value = img.info.get('dpi')
+                
+                if dpi_value and dpi_value != (0, 0):
+                    resolution_x, resolution_y = dpi_value
+                else:
+                    resolution_x = None
+                    resolution_y = None
+                
+                color_depth = img.bits if hasattr(img, 'bits') else 24
+                
+                compression = img.info.get('compression', 'DEFLATE')
+                
+                info = ImageInfo(
+                    filename=filepath.name,
+                    filepath=str(filepath),
+                    file_size=file_size,
+                    width=width,
+                    height=height,
+                    resolution_x=resolution_x,
+                    resolution_y=resolution_y,
+                    color_depth=color_depth,
+                    compression=compression,
+                    format="PNG"
+                )
+                
+                if 'gamma' in img.info:
+                    info.additional_info["gamma"] = img.info['gamma']
+                
+                return info
+        except Exception as e:
+            print(f"Ошибка при анализе PNG {filepath}: {e}")
+        
+        return None
+    
+    def _read_tiff_values(self, header: HeaderBuffer, order: str, field_type: int, count: int, value: bytes,
+                          base: int = 0) -> Tuple:
+        fmt = self.TIFF_FIELD_TYPES.get(field_type)
+        if fmt is None or count > 64:
+            return ()
+        
+        fmt = order + fmt * count
+        size = struct.calcsize(fmt)
+        if size > 4:
+            values = header.unpack(fmt, base + struct.unpack(order + 'I', value)[0])
+        else:
+            values = struct.unpack_from(fmt, value)
+        
+        if field_type == 5:
+            return tuple(n / d if d else 0 for n, d in zip(values[::2], values[1::2]))
+        return values
+    
+    def _read_tiff_tags(self, header: HeaderBuffer, base: int = 0) -> Optional[Dict]:
+        data = header.read(base, 8)
+        order = {b'II': '<', b'MM': '>'}.get(data[:2])
+        if order is None or len(data) < 8:
+            return None
+        
+        magic, offset = struct.unpack_from(order + 'HI', data, 2)
+        if magic != 42:
+            return None
+        
+        count = header.unpack(order + 'H', base + offset)[0]
+        entries = header.read(base + offset + 2, 12 * count)
+        
+        tags = {}
+        for i in range(len(entries) // 12):
+            tag, field_type, n, value = struct.unpack_from(order + 'HHI4s', entries, 12 * i)
+            if tag in self.TIFF_TAGS:
+                tags[tag] = self._read_tiff_values(header, order, field_type, n, value, base)
+        return tags
+    
+    def _tiff_resolution(self, tags: Dict) -> Optional[Tuple[float, float]]:
+        unit = (tags.get(296) or (2,))[0]
+        scale = {2: 1, 3: 2.54}.get(unit)
+        resolution_x = (tags.get(282) or (0,))[0]
+        resolution_y = (tags.get(283) or (0,))[0]
+        if not scale or not resolution_x or not resolution_y:
+            return None
+        return resolution_x * scale, resolution_y * scale
+    
+    def _read_tiff_header(self, filepath: Path, file_size: int) -> Optional[ImageInfo]:
+        with open(filepath, 'rb', buffering=0) as f:
+            tags = self._read_tiff_tags(HeaderBuffer(f, self.HEADER_BYTES))
+        
+        if not tags or not tags.get(256) or not tags.get(257):
+            return None
+        
+        bits = tags.get(258) or (1,)
+        samples = (tags.get(277) or (1,))[0]
+        color_depth = sum(bits) if len(bits) == samples else bits[0] * samples
+        
+        compression = (tags.get(259) or (1,))[0]
+        resolution_x, resolution_y = self._tiff_resolution(tags) or (72, 72)
+        
+        has_palette = (tags.get(262) or (None,))[0] == 3
+        if has_palette and bits[0] > 16:
+            return None
+        
+        return ImageInfo(
+            filename=filepath.name,
+            filepath=str(filepath),
+            file_size=file_size,
+            width=tags[256][0],
+            height=tags[257][0],
+            resolution_x=resolution_x,
+            resolution_y=resolution_y,
+            color_depth=color_depth,
+            compression=self.TIFF_COMPRESSION.get(compression, f"Unknown ({compression})"),
+            format="TIFF",
+            has_palette=has_palette,
+            palette_colors=1 << bits[0] if has_palette else 0
+        )
+    
+    def _analyze_tiff(self, filepath: Path, file_size: int) -> Optional[ImageInfo]:
+        try:
+            info = self._read_tiff_header(filepath, file_size)
+            if info:
+                return info
+        except (OSError, struct.error):
+            pass
+        
+        try:
+            with Image.open(filepath) as img:
+                width, height = img.size
+                
+                dpi_value = img.info.get('dpi')
+                if dpi_value:
+                    resolution_x, resolution_y = dpi_value
+                    if resolution_x == 0:
+                        resolution_x = 72
+                    if resolution_y == 0:
+                        resolution_y = 72
+                else:
+                    resolution_x = resolution_y = 72
+                
+                color_depth = img.bits if hasattr(img, 'bits') else 24
+                
+                compression = img.info.get('compression', 'None')
+                if compression == 'tiff_lzw':
+                    compression = "LZW"
+                elif compression == 'tiff_ccitt':
+                    compression = "CCITT"
+                
+                info = ImageInfo(
+                    filename=filepath.name,
+                    filepath=str(filepath),
+                    file_size=file_size,
+                    width=width,
+                    height=height,
+                    resolution_x=resolution_x,
+                    resolution_y=resolution_y,
+                    color_depth=color_depth,
+                    compression=compression,
+                    format="TIFF"
+                )
+                
+                return info
+        except Exception as e:
+            print(f"Ошибка при анализе TIFF {filepath}: {e}")
+        
+        return None
+    
+    def _analyze_pcx(self, filepath: Path, file_size: int) -> Optional[ImageInfo]:
+        try:
+            with open(filepath, 'rb', buffering=0) as f:
+                data = f.read(128)
+            
+            if data[:1] != b'\x0a':
+                return None
+            
+            (manufacturer, version, encoding, bits_per_pixel,
+             xmin, ymin, xmax, ymax, hdpi, vdpi) = struct.unpack_from('<BBBBHHHHHH', data)
+            
+            width = xmax - xmin + 1
+            height = ymax - ymin + 1
+            
+            resolution_x = hdpi if hdpi > 0 else 96
+            resolution_y = vdpi if vdpi > 0 else 96
+            
+            compression = "RLE" if encoding == 1 else "None"
+            
+            color_depth = bits_per_pixel
+            
+            info = ImageInfo(
+                filename=filepath.name,
+                filepath=str(filepath),
+                file_size=file_size,
+                width=width,
+                height=height,
+                resolution_x=resolution_x,
+                resolution_y=resolution_y,
+                color_depth=color_depth,
+                compression=compression,
+                format="PCX"
+            )
+            
+            info.additional_info["pcx_version"] = version
+            
+            return info
+            
+        except Exception as e:
+            print(f"Ошибка при анализе PCX {filepath}: {e}")
+        
+        return None
+    
+    def analyze_files(self, filepaths: List[str]) -> List[ImageInfo]:
+        results = []
+        for filepath in filepaths:
+            result = self.analyze_file(filepath)
+            if result:
+                results.append(result)
+        return results
+    
+    def _matches(self, name: str, relpath: str, patterns: List[str]) -> bool:
+        return any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(relpath, pattern) for pattern in patterns)
+    
+    def _scan_directory(self, path: str, prefix_len: int, include: Optional[List[str]],
+                        exclude: Optional[List[str]], descend: bool,
+                        follow_symlinks: bool) -> Tuple[List, List, bool]:
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    relpath = entry.path[prefix_len:]
+                    if exclude and self._matches(entry.name, relpath, exclude):
+                        continue
+                    
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        if descend:
+                            key = None
+                            if follow_symlinks:
+                                stat = os.stat(entry.path)
+                                key = (stat.st_dev, stat.st_ino)
+                            subdirs.append((entry.path, key))
+                    elif (os.path.splitext(entry.name)[1].lower() in self.supported_formats
+                          and entry.is_file()
+                          and (not include or self._matches(entry.name, relpath, include))):
+                        files.append(entry.path)
+        except OSError as e:
+            print(f"Ошибка при чтении папки {path}: {e}")
+            return files, subdirs, False
+        
+        return files, subdirs, True
+    
+    def _discover_files(self, folder_path: str, recursive: bool = False, max_depth: Optional[int] = None,
+                        include: Optional[List[str]] = None, exclude: Optional[List[str]] = None,
+                        follow_symlinks: bool = False, walkers: int = 8) -> Iterator[str]:
+        if not recursive:
+            max_depth = 0
+        
+        prefix_len = len(os.path.join(folder_path, ''))
+        visited = None
+        if follow_symlinks:
+            stat = os.stat(folder_path)
+            visited = {(stat.st_dev, stat.st_ino)}
+        
+        directories = [(folder_path, 0)]
+        scans = {}
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=walkers) as executor:
+            try:
+                while directories or scans:
+                    while directories and len(scans) < walkers * 2:
+                        path, depth = directories.pop()
+                        descend = max_depth is None or depth < max_depth
+                        future = executor.submit(self._scan_directory, path, prefix_len, include, exclude,
+                                                 descend, follow_symlinks)
+                        scans[future] = (path, depth)
+                    
+                    done, _ = concurrent.futures.wait(scans, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        path, depth = scans.pop(future)
+                        files, subdirs, listed = future.result()
+                        if not listed:
+                            self.unlisted_directories.append(path)
+                        
+                        for path, key in subdirs:
+                            if visited is not None:
+                                if key in visited:
+                                    continue
+                                visited.add(key)
+                            directories.append((path, depth + 1))
+                        
+                        yield from files
+            finally:
+                for future in scans:
+                    future.cancel()
+    
+    def _removal_scope(self, folder_path: str, recursive: bool = False, max_depth: Optional[int] = None,
+                       include: Optional[List[str]] = None, exclude: Optional[List[str]] = None,
+                       follow_symlinks: bool = False):
+        root = os.path.join(os.path.abspath(folder_path), '')
+        unlisted = tuple(os.path.join(os.path.abspath(path), '') for path in self.unlisted_directories)
+        if not recursive:
+            max_depth = 0
+        
+        def in_scope(filepath: str) -> bool:
+            if not filepath.startswith(root) or filepath.startswith(unlisted):
+                return False
+            
+            relpath = filepath[len(root):]
+            parts = relpath.split(os.sep)
+            if max_depth is not None and len(parts) - 1 > max_depth:
+                return False
+            if os.path.splitext(parts[-1])[1].lower() not in self.supported_formats:
+                return False
+            
+            for depth, name in enumerate(parts):
+                partial = os.sep.join(parts[:depth + 1])
+                if exclude and self._matches(name, partial, exclude):
+                    return False
+                if depth < len(parts) - 1 and not follow_symlinks and os.path.islink(root + partial):
+                    return False
+            
+            return not include or self._matches(parts[-1], relpath, include)
+        
+        return in_scope
+    
+    def _limit_files(self, filepaths: Iterator[str], max_files: int) -> Iterator[str]:
+        self.discovery_truncated = False
+        for count, filepath in enumerate(filepaths):
+            if count >= max_files:
+                self.discovery_truncated = True
+                return
+            yield filepath
+    
+    def _chunked(self, filepaths: Iterator[str], chunk_size: int) -> Iterator[List[str]]:
+        while True:
+            chunk = list(islice(filepaths, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+    
+    def iter_folder(self, folder_path: str, max_files: int = 100000, backend: str = "thread",
+                    workers: Optional[int] = None, chunk_size: int = 256, max_pending: Optional[int] = None,
+                    progress_callback=None, recursive: bool = False, max_depth: Optional[int] = None,
+                    include: Optional[List[str]] = None, exclude: Optional[List[str]] = None,
+                    follow_symlinks: bool = False, walkers: int = 8,
+                    cache: Optional[MetadataCache] = None) -> Iterator[ImageInfo]:
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Неизвестный режим '{backend}', ожидается один из {self.BACKENDS}")
+        
+        self.discovery_truncated = False
+        self.unlisted_directories = []
+        if not os.path.isdir(folder_path):
+            return
+        
+        filepaths = self._limit_files(self._discover_files(folder_path, recursive, max_depth, include, exclude,
+                                                           follow_symlinks, walkers), max_files)
+        chunks = self._chunked(filepaths, chunk_size)
+        processed = discovered = 0
+        
+        if backend == "serial":
+            for chunk in chunks:
+                discovered += len(chunk)
+                if cache is not None:
+                    hits, chunk = cache.lookup(chunk)
+                    processed += len(hits)
+                    yield from hits
+                
+                results = []
+                for filepath in chunk:
+                    result = self.analyze_file(filepath)
+                    if result:
+                        results.append(result)
+                        yield result
+                
+                if cache is not None:
+                    cache.store(chunk, results)
+                
+                processed += len(chunk)
+                if progress_callback:
+                    progress_callback(processed, discovered)
+            return
+        
+        workers = workers or os.cpu_count() or 1
+        max_pending = max_pending or workers * 2
+        executor_class = (concurrent.futures.ProcessPoolExecutor if backend == "process"
+                          else concurrent.futures.ThreadPoolExecutor)
+        
+        pending = {}
+        exhausted = False
+        
+        with executor_class(max_workers=workers) as executor:
+            try:
+                while pending or not exhausted:
+                    while not exhausted and len(pending) < max_pending:
+                        chunk = next(chunks, None)
+                        if chunk is None:
+                            exhausted = True
+                            break
+                        
+                        discovered += len(chunk)
+                        if cache is not None:
+                            hits, chunk = cache.lookup(chunk)
+                            processed += len(hits)
+                            yield from hits
+                            if not chunk:
+                                continue
+                        
+                        pending[executor.submit(self.analyze_files, chunk)] = chunk
+                    
+                    if not pending:
+                        continue
+                    
+                    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        chunk = pending.pop(future)
+                        results = future.result()
+                        if cache is not None:
+                            cache.store(chunk, results)
+                        
+                        processed += len(chunk)
+                        yield from results
+                        
+                        if progress_callback:
+                            progress_callback(processed, discovered)
+            finally:
+                for future in pending:
+                    future.cancel()
+    
+    async def aiter_folder(self, folder_path: str, max_files: int = 100000, concurrency: int = 64,
+                           chunk_size: int = 256, progress_callback=None, recursive: bool = False,
+                           max_depth: Optional[int] = None, include: Optional[List[str]] = None,
+                           exclude: Optional[List[str]] = None, follow_symlinks: bool = False,
+                           walkers: int = 8, cache: Optional[MetadataCache] = None) -> AsyncIterator[ImageInfo]:
+        loop = asyncio.get_running_loop()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=concurrency + 1)
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        def read_header(filepath):
+            future = loop.run_in_executor(executor, self.analyze_file, filepath)
+            future.add_done_callback(lambda _: semaphore.release())
+            return future
+        
+        pending = {}
+        ready = []
+        stored_paths = []
+        stored_results = []
+        processed = discovered = 0
+        exhausted = False
+        
+        try:
+            self.discovery_truncated = False
+            self.unlisted_directories = []
+            if not await loop.run_in_executor(executor, os.path.isdir, folder_path):
+                return
+            
+            filepaths = self._limit_files(self._discover_files(folder_path, recursive, max_depth, include,
+                                                               exclude, follow_symlinks, walkers), max_files)
+            chunks = self._chunked(filepaths, chunk_size)
+            
+            while pending or ready or not exhausted:
+                if not ready and not exhausted and len(pending) < concurrency:
+                    chunk = await loop.run_in_executor(executor, next, chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                    else:
+                        discovered += len(chunk)
+                        if cache is not None:
+                            hits, chunk = await loop.run_in_executor(executor, cache.lookup, chunk)
+                            processed += len(hits)
+                            for info in hits:
+                                yield info
+                        ready.extend(chunk)
+                
+                while ready and not semaphore.locked():
+                    await semaphore.acquire()
+                    filepath = ready.pop(0)
+                    pending[read_header(filepath)] = filepath
+                
+                if not pending:
+                    continue
+                
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    filepath = pending.pop(future)
+                    result = future.result()
+                    processed += 1
+                    
+                    if cache is not None:
+                        stored_paths.append(filepath)
+                        if result:
+                            stored_results.append(result)
+                        if len(stored_paths) >= chunk_size:
+                            await loop.run_in_executor(executor, cache.store, stored_paths, stored_results)
+                            stored_paths, stored_results = [], []
+                    
+                    if result:
+                        yield result
+                
+                if progress_callback:
+                    progress_callback(processed, discovered)
+            
+            if stored_paths:
+                await loop.run_in_executor(executor, cache.store, stored_paths, stored_results)
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+    
+    def analyze_folder(self, folder_path: str, max_files: int = 100000, 
+                      use_multithreading: bool = True, progress_callback=None,
+                      backend: Optional[str] = None, workers: Optional[int] = None,
+                      chunk_size: int = 256, cache: Optional[MetadataCache] = None,
+                      **scan_options) -> ImageInfoTable:
+        if backend is None:
+            backend = "thread" if use_multithreading else "serial"
+        
+        start_time = time.time()
+        
+        results = ImageInfoTable(self.iter_folder(folder_path, max_files, backend, workers, chunk_size,
+                                                  progress_callback=progress_callback, cache=cache,
+                                                  **scan_options))
+        
+        end_time = time.time()
+        self.processing_time = end_time - start_time
+        self.total_files_processed = len(results)
+        
+        if progress_callback:
+            progress_callback(len(results), len(results))
+        
+        return results
+    
+    def rescan_folder(self, folder_path: str, manifest: ScanManifest, max_files: int = 100000,
+                      backend: str = "thread", workers: Optional[int] = None, chunk_size: int = 256,
+                      progress_callback=None, **scan_options) -> ScanDelta:
+        start_time = time.time()
+        
+        manifest.begin()
+        for _ in self.iter_folder(folder_path, max_files, backend, workers, chunk_size,
+                                  progress_callback=progress_callback, cache=manifest, **scan_options):
+            pass
+        scope_options = {key: value for key, value in scan_options.items() if key != "walkers"}
+        delta = manifest.finish(complete=not self.discovery_truncated,
+                                in_scope=self._removal_scope(folder_path, **scope_options))
+        
+        end_time = time.time()
+        self.processing_time = end_time - start_time
+        self.total_files_processed = len(delta.added) + len(delta.modified) + len(delta.unreadable)
+        
+        return delta
+
+class ImageAnalyzerGUI:
+    BACKEND_LABELS = {"thread": "Потоки", "process": "Процессы", "serial": "Последовательно"}
+    RESULT_BATCH = 500
+    CACHE_PATH = Path.home() / ".lab2_metadata_cache.sqlite"
+    MANIFEST_DIR = Path.home() / ".lab2_manifests"
+    CHANGE_LABELS = {"added": "новый", "modified": "изменен", "unreadable": "не читается", "removed": "удален"}
+    VIEW_LABELS = {"merged": "Все файлы", "changed": "Только изменения"}
+    
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Анализатор графических файлов")
+        self.root.geometry("1200x700")
+        
+        self.analyzer = ImageFileAnalyzer()
+        self.current_results = ImageInfoTable()
+        self.total_size = 0
+        self.cache = None
+        self.last_delta = None
+        self.change_status = {}
+        
+        self.queue = queue.Queue()
+        
+        self.is_processing = False
+        self.processing_thread = None
+        
+        self.setup_ui()
+        
+        self.check_queue()
+    
+    def setup_ui(self):
+        main_frame = ttk.Frame(self.root, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(1, weight=1)
+        main_frame.rowconfigure(3, weight=1)
+        
+        title_label = ttk.Label(
+            main_frame, 
+            text="Анализатор графических файлов", 
+            font=("Arial", 16, "bold")
+        )
+        title_label.grid(row=0, column=0, columnspan=3, pady=(0, 10))
+        
+        control_frame = ttk.LabelFrame(main_frame, text="Управление", padding="10")
+        control_frame.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        ttk.Button(
+            control_frame, 
+            text="Выбрать папку", 
+            command=self.select_folder,
+            width=15
+        ).grid(row=0, column=0, padx=(0, 10))
+        
+        ttk.Button(
+            control_frame, 
+            text="Анализировать файл", 
+            command=self.select_file,
+            width=15
+        ).grid(row=0, column=1, padx=(0, 10))
+        
+        self.stop_button = ttk.Button(
+            control_frame, 
+            text="Остановить", 
+            command=self.stop_processing,
+            width=15,
+            state=tk.DISABLED
+        )
+        self.stop_button.grid(row=0, column=2, padx=(0, 10))
+        
+        self.progress_var = tk.DoubleVar()
+        self.progress_bar = ttk.Progressbar(
+            control_frame, 
+            variable=self.progress_var,
+            maximum=100,
+            length=200
+        )
+        self.progress_bar.grid(row=0, column=3, padx=(20, 10))
+        
+        self.status_label = ttk.Label(control_frame, text="Готов к работе")
+        self.status_label.grid(row=0, column=4, padx=(10, 0))
+        
+        settings_frame = ttk.LabelFrame(main_frame, text="Настройки", padding="10")
+        settings_frame.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        ttk.Label(settings_frame, text="Макс. файлов:").grid(row=0, column=0, padx=(0, 5))
+        self.max_files_var = tk.StringVar(value="100000")
+        max_files_spinbox = ttk.Spinbox(
+            settings_frame,
+            from_=1,
+            to=100000,
+            textvariable=self.max_files_var,
+            width=10
+        )
+        max_files_spinbox.grid(row=0, column=1, padx=(0, 20))
+        
+        ttk.Label(settings_frame, text="Режим:").grid(row=0, column=2, padx=(0, 5))
+        self.backend_var = tk.StringVar(value=self.BACKEND_LABELS["thread"])
+        ttk.Combobox(
+            settings_frame,
+            textvariable=self.backend_var,
+            values=list(self.BACKEND_LABELS.values()),
+            state="readonly",
+            width=16
+        ).grid(row=0, column=3, padx=(0, 20))
+        
+        ttk.Label(settings_frame, text="Исполнителей:").grid(row=0, column=4, padx=(0, 5))
+        self.workers_var = tk.StringVar(value=str(os.cpu_count() or 1))
+        ttk.Spinbox(
+            settings_frame,
+            from_=1,
+            to=256,
+            textvariable=self.workers_var,
+            width=5
+        ).grid(row=0, column=5, padx=(0, 20))
+        
+        ttk.Label(settings_frame, text="Форматы:").grid(row=0, column=6, padx=(0, 5))
+        formats_text = ", ".join(sorted(self.analyzer.supported_formats))
+        ttk.Label(settings_frame, text=formats_text, foreground="blue").grid(row=0, column=7)
+        
+        self.recursive_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            settings_frame,
+            text="Включая подпапки",
+            variable=self.recursive_var
+        ).grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        
+        ttk.Label(settings_frame, text="Макс. глубина:").grid(row=1, column=2, padx=(0, 5), pady=(5, 0))
+        self.max_depth_var = tk.StringVar(value="")
+        ttk.Entry(settings_frame, textvariable=self.max_depth_var, width=6).grid(row=1, column=3, sticky=tk.W, pady=(5, 0))
+        
+        ttk.Label(settings_frame, text="Включать:").grid(row=1, column=4, padx=(0, 5), pady=(5, 0))
+        self.include_var = tk.StringVar(value="")
+        ttk.Entry(settings_frame, textvariable=self.include_var, width=20).grid(row=1, column=5, pady=(5, 0))
+        
+        ttk.Label(settings_frame, text="Исключать:").grid(row=1, column=6, padx=(0, 5), pady=(5, 0))
+        self.exclude_var = tk.StringVar(value="")
+        ttk.Entry(settings_frame, textvariable=self.exclude_var, width=20).grid(row=1, column=7, sticky=tk.W, pady=(5, 0))
+        
+        self.cache_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            settings_frame,
+            text="Кэш метаданных",
+            variable=self.cache_var
+        ).grid(row=1, column=8, padx=(20, 0), pady=(5, 0))
+        
+        self.incremental_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            settings_frame,
+            text="Инкрементально",
+            variable=self.incremental_var
+        ).grid(row=1, column=9, padx=(10, 0), pady=(5, 0))
+        
+        results_frame = ttk.LabelFrame(main_frame, text="Результаты", padding="10")
+        results_frame.grid(row=3, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S))
+        results_frame.columnconfigure(0, weight=1)
+        results_frame.rowconfigure(0, weight=1)
+        
+        columns = ("filename", "size", "resolution", "depth", "compression", "format", "filesize", "change")
+        self.tree = ttk.Treeview(results_frame, columns=columns, show="headings", height=15)
+        
+        self.tree.heading("filename", text="Имя файла")
+        self.tree.heading("size", text="Размер (пикс)")
+        self.tree.heading("resolution", text="Разрешение (DPI)")
+        self.tree.heading("depth", text="Глубина цвета")
+        self.tree.heading("compression", text="Сжатие")
+        self.tree.heading("format", text="Формат")
+        self.tree.heading("filesize", text="Размер файла")
+        self.tree.heading("change", text="Изменение")
+        
+        self.tree.column("filename", width=200)
+        self.tree.column("size", width=100)
+        self.tree.column("resolution", width=120)
+        self.tree.column("depth", width=100)
+        self.tree.column("compression", width=100)
+        self.tree.column("format", width=80)
+        self.tree.column("filesize", width=100)
+        self.tree.column("change", width=80)
+        
+        scrollbar_y = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        scrollbar_x = ttk.Scrollbar(results_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(yscrollcommand=scrollbar_y.set, xscrollcommand=scrollbar_x.set)
+        
+        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        scrollbar_y.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        scrollbar_x.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        
+        self.tree.bind("<Double-1>", self.show_file_details)
+        
+        stats_frame = ttk.Frame(main_frame)
+        stats_frame.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(10, 0))
+        
+        self.total_files_label = ttk.Label(stats_frame, text="Файлов: 0")
+        self.total_files_label.grid(row=0, column=0, padx=(0, 20))
+        
+        self.total_size_label = ttk.Label(stats_frame, text="Общий размер: 0 MB")
+        self.total_size_label.grid(row=0, column=1, padx=(0, 20))
+        
+        self.time_label = ttk.Label(stats_frame, text="Время: 0.00 сек")
+        self.time_label.grid(row=0, column=2, padx=(0, 20))
+        
+        ttk.Label(stats_frame, text="Показать:").grid(row=0, column=3, padx=(0, 5))
+        self.view_var = tk.StringVar(value=self.VIEW_LABELS["merged"])
+        view_combobox = ttk.Combobox(
+            stats_frame,
+            textvariable=self.view_var,
+            values=list(self.VIEW_LABELS.values()),
+            state="readonly",
+            width=16
+        )
+        view_combobox.grid(row=0, column=4, padx=(0, 20))
+        view_combobox.bind("<<ComboboxSelected>>", lambda event: self.refresh_view())
+        
+        export_frame = ttk.Frame(stats_frame)
+        export_frame.grid(row=0, column=5, sticky=tk.E)
+        
+        ttk.Button(
+            export_frame,
+            text="Экспорт в CSV",
+            command=self.export_csv,
+            width=15
+        ).grid(row=0, column=0, padx=(0, 5))
+        
+        ttk.Button(
+            export_frame,
+            text="Экспорт в TXT",
+            command=self.export_txt,
+            width=15
+        ).grid(row=0, column=1)
+        
+        ttk.Button(
+            export_frame,
+            text="Справка",
+            command=self.show_help,
+            width=15
+        ).grid(row=0, column=2, padx=(5, 0))
+    
+    def select_folder(self):
+        if self.is_processing:
+            messagebox.showwarning("Внимание", "Анализ уже выполняется")
+            return
+        
+        folder_path = filedialog.askdirectory(title="Выберите папку с изображениями")
+        if folder_path:
+            self.start_processing(folder_path)
+    
+    def select_file(self):
+        if self.is_processing:
+            messagebox.showwarning("Внимание", "Анализ уже выполняется")
+            return
+        
+        file_path = filedialog.askopenfilename(
+            title="Выберите файл изображения",
+            filetypes=[
+                ("Все поддерживаемые", "*.jpg;*.jpeg;*.gif;*.tif;*.tiff;*.bmp;*.png;*.pcx"),
+                ("JPEG", "*.jpg;*.jpeg"),
+                ("GIF", "*.gif"),
+                ("TIFF", "*.tif;*.tiff"),
+                ("BMP", "*.bmp"),
+                ("PNG", "*.png"),
+                ("PCX", "*.pcx"),
+                ("Все файлы", "*.*")
+            ]
+        )
+        
+        if file_path:
+            self.start_processing_single(file_path)
+    
+    def start_processing(self, folder_path):
+        self.is_processing = True
+        self.current_results = ImageInfoTable()
+        self.total_size = 0
+        self.last_delta = None
+        self.change_status = {}
+        self.clear_table()
+        self.update_status("Начинаю анализ...")
+        self.progress_var.set(0)
+        
+        try:
+            max_files = int(self.max_files_var.get())
+        except:
+            max_files = 100000
+        
+        backend = next((name for name, label in self.BACKEND_LABELS.items() 
+                        if label == self.backend_var.get()), "thread")
+        
+        try:
+            workers = int(self.workers_var.get())
+        except:
+            workers = None
+        
+        try:
+            max_depth = int(self.max_depth_var.get())
+        except:
+            max_depth = None
+        
+        scan_options = {
+            'recursive': self.recursive_var.get(),
+            'max_depth': max_depth,
+            'include': self.parse_patterns(self.include_var.get()),
+            'exclude': self.parse_patterns(self.exclude_var.get()),
+        }
+        
+        self.processing_thread = threading.Thread(
+            target=self.process_folder,
+            args=(folder_path, max_files, backend, workers, scan_options, self.cache_var.get(),
+                  self.incremental_var.get()),
+            daemon=True
+        )
+        self.processing_thread.start()
+        
+        self.stop_button.configure(state=tk.NORMAL)
+    
+    def start_processing_single(self, file_path):
+        self.is_processing = True
+        self.current_results = ImageInfoTable()
+        self.last_delta = None
+        self.change_status = {}
+        self.clear_table()
+        self.update_status("Анализирую файл...")
+        self.progress_var.set(0)
+        
+        self.processing_thread = threading.Thread(
+            target=self.process_single_file,
+            args=(file_path,),
+            daemon=True
+        )
+        self.processing_thread.start()
+        
+        self.stop_button.configure(state=tk.NORMAL)
+    
+    def parse_patterns(self, text):
+        patterns = [pattern.strip() for pattern in text.split(";") if pattern.strip()]
+        return patterns or None
+    
+    def manifest_path(self, folder_path):
+        digest = hashlib.sha1(os.path.abspath(folder_path).encode("utf-8")).hexdigest()[:16]
+        return self.MANIFEST_DIR / f"{digest}.sqlite"
+    
+    def process_folder(self, folder_path, max_files, backend, workers, scan_options, use_cache, incremental=False):
+        manifest = None
+        try:
+            def progress_callback(current, total):
+                if total > 0:
+                    progress = (current / total) * 100
+                    self.queue.put(("progress", progress))
+                    self.queue.put(("status", f"Обработано {current} файлов (найдено {total})"))
+            
+            cache = None
+            if incremental:
+                self.MANIFEST_DIR.mkdir(parents=True, exist_ok=True)
+                manifest = ScanManifest(str(self.manifest_path(folder_path)))
+                manifest.begin()
+                cache = manifest
+            elif use_cache:
+                if self.cache is None:
+                    self.cache = MetadataCache(str(self.CACHE_PATH))
+                cache = self.cache
+                cache.reset_stats()
+            
+            start_time = time.time()
+            count = 0
+            batch = []
+            stopped = False
+            for info in self.analyzer.iter_folder(folder_path, max_files, backend, workers,
+                                                  progress_callback=progress_callback, cache=cache,
+                                                  **scan_options):
+                if not self.is_processing:
+                    stopped = True
+                    break
+                
+                batch.append(info)
+                if len(batch) >= self.RESULT_BATCH:
+                    self.queue.put(("partial", batch))
+                    count += len(batch)
+                    batch = []
+            
+            if batch:
+                self.queue.put(("partial", batch))
+                count += len(batch)
+            
+            self.analyzer.processing_time = time.time() - start_time
+            self.analyzer.total_files_processed = count
+            
+            status = f"Анализ завершен. Обработано {count} файлов"
+            if manifest is not None and not stopped:
+                delta = manifest.finish(complete=not self.analyzer.discovery_truncated,
+                                        in_scope=self.analyzer._removal_scope(folder_path, **scan_options))
+                self.analyzer.total_files_processed = len(delta.added) + len(delta.modified) + len(delta.unreadable)
+                self.queue.put(("delta", delta))
+                status = (f"Анализ завершен. Новых: {len(delta.added)}, изменено: {len(delta.modified)}, "
+                          f"не читается: {len(delta.unreadable)}, удалено: {len(delta.removed)}, "
+                          f"без изменений: {len(delta.unchanged)}")
+                if not delta.complete:
+                    status += " (достигнут лимит файлов, удаления не определялись)"
+            elif cache is not None:
+                status += f" (кэш: {cache.hits} попаданий, {cache.misses} промахов)"
+            
+            self.queue.put(("partial", []))
+            self.queue.put(("status", status))
+            self.queue.put(("progress", 100))
+            
+        except Exception as e:
+            self.queue.put(("error", f"Ошибка при анализе: {str(e)}"))
+        finally:
+            if manifest is not None:
+                manifest.close()
+            self.queue.put(("finished", None))
+    
+    def process_single_file(self, file_path):
+        try:
+            self.queue.put(("progress", 10))
+            self.queue.put(("status", "Анализирую файл..."))
+            
+            result = self.analyzer.analyze_file(file_path)
+            
+            if result:
+                results = [result]
+                self.queue.put(("results", results))
+                self.queue.put(("status", "Файл успешно проанализирован"))
+            else:
+                self.queue.put(("error", "Не удалось проанализировать файл"))
+            
+            self.queue.put(("progress", 100))
+            
+        except Exception as e:
+            self.queue.put(("error", f"Ошибка при анализе: {str(e)}"))
+        finally:
+            self.queue.put(("finished", None))
+    
+    def stop_processing(self):
+        if self.is_processing:
+            self.is_processing = False
+            self.update_status("Остановка...")
+            messagebox.showinfo("Информация", "Остановка будет выполнена после завершения текущих операций")
+    
+    def check_queue(self):
+        try:
+            while True:
+                msg_type, data = self.queue.get_nowait()
+                
+                if msg_type == "progress":
+                    self.progress_var.set(data)
+                elif msg_type == "status":
+                    self.update_status(data)
+                elif msg_type == "results":
+                    self.display_results(data)
+                elif msg_type == "partial":
+                    self.append_results(data)
+                elif msg_type == "delta":
+                    self.show_delta(data)
+                elif msg_type == "error":
+                    messagebox.showerror("Ошибка", data)
+                    self.processing_finished()
+                elif msg_type == "finished":
+                    self.processing_finished()
+                
+        except queue.Empty:
+            pass
+        
+        self.root.after(100, self.check_queue)
+    
+    def update_status(self, message):
+        self.status_label.config(text=message)
+        self.root.update_idletasks()
+    
+    def clear_table(self):
+        for item in self.tree.get_children():
+            self.tree.delete(item)
+    
+    def display_results(self, results):
+        self.current_results = ImageInfoTable()
+        self.total_size = 0
+        self.clear_table()
+        self.append_results(results)
+    
+    def show_delta(self, delta):
+        self.last_delta = delta
+        self.change_status = {}
+        for change in self.CHANGE_LABELS:
+            for info in getattr(delta, change):
+                self.change_status[info.filepath] = self.CHANGE_LABELS[change]
+        self.refresh_view()
+    
+    def refresh_view(self):
+        if self.last_delta is None:
+            return
+        
+        view = next((name for name, label in self.VIEW_LABELS.items() 
+                     if label == self.view_var.get()), "merged")
+        self.display_results(getattr(self.last_delta, view))
+    
+    def append_results(self, results):
+        start = len(self.current_results)
+        self.current_results.extend(results)
+        
+        for index, info in enumerate(results, start):
+            if info.resolution_x is not None and info.resolution_y is not None:
+                resolution = f"{info.resolution_x:.1f}×{info.resolution_y:.1f}"
+            else:
+                resolution = "N/A"
+            
+            size_mb = info.file_size / (1024 * 1024)
+            
+            self.tree.insert("", tk.END, iid=str(index), values=(
+                info.filename,
+                f"{info.width}×{info.height}",
+                resolution,
+                f"{info.color_depth} бит",
+                info.compression,
+                info.format,
+                f"{size_mb:.2f} MB",
+                self.change_status.get(info.filepath, "")
+            ))
+        
+        self.total_size += sum(info.file_size for info in results)
+        total_size_mb = self.total_size / (1024 * 1024)
+        
+        self.total_files_label.config(text=f"Файлов: {len(self.current_results)}")
+        self.total_size_label.config(text=f"Общий размер: {total_size_mb:.2f} MB")
+        self.time_label.config(text=f"Время: {self.analyzer.processing_time:.2f} сек")
+    
+    def processing_finished(self):
+        self.is_processing = False
+        self.progress_var.set(0)
+        
+        self.stop_button.configure(state=tk.DISABLED)
+    
+    def show_file_details(self, event):
+        selection = self.tree.selection()
+        if not selection:
+            return
+        
+        self.show_details_window(self.current_results[int(selection[0])])
+    
+    def show_details_window(self, info):
+        details_window = tk.Toplevel(self.root)
+        details_window.title(f"Детали: {info.filename}")
+        details_window.geometry("600x500")
+        details_window.transient(self.root)
+        details_window.grab_set()
+        
+        main_frame = ttk.Frame(details_window, padding="20")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        details_window.columnconfigure(0, weight=1)
+        details_window.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(1, weight=1)
+        
+        row = 0
+        
+        ttk.Label(main_frame, text="Имя файла:", font=("Arial", 10, "bold")).grid(row=row, column=0, sticky=tk.W, pady=5)
+        ttk.Label(main_frame, text=info.filename).grid(row=row, column=1, sticky=tk.W, pady=5)
+        row += 1
+        
+        ttk.Label(main_frame, text="Путь:", font=("Arial", 10, "bold")).grid(row=row, column=0, sticky=tk.W, pady=5)
+        path_label = ttk.Label(main_frame, text=info.filepath, wraplength=400)
+        path_label.grid(row=row, column=1, sticky=tk.W, pady=5)
+        row += 1
+        
+        ttk.Label(main_frame, text="Размер файла:", font=("Arial", 10, "bold")).grid(row=row, column=0, sticky=tk.W, pady=5)
+        size_mb = info.file_size / (1024 * 1024)
+        ttk.Label(main_frame, text=f"{info.file_size:,} байт ({size_mb:.2f} MB)").grid(row=row, column=1, sticky=tk.W, pady=5)
+        row += 1
+        
+        ttk.Label(main_frame, text="Размер изображения:", font=("Arial", 10, "bold")).grid(row=row, column=0, sticky=tk.W, pady=5)
+        ttk.Label(main_frame, text=f"{info.width} × {info.height} пикселей").grid(row=row, column=1, sticky=tk.W, pady=5)
+        row += 1
+        
+        ttk.Label(main_frame, text="Разрешение:", font=("Arial", 10, "bold")).grid(row=row, column=0, sticky=tk.W, pady=5)
+        if info.resolution_x is not None and info.resolution_y is not None:
+            resolution = f"{info.resolution_x:.1f} × {info.resolution_y:.1f} DPI"
+        else:
+            resolution = "N/A"
+        ttk.Label(main_frame, text=resolution).grid(row=row, column=1, sticky=tk.W, pady=5)
+        row += 1
+        
+        ttk.Label(main_frame, text="Глубина цвета:", font=("Arial", 10, "bold")).grid(row=row, column=0, sticky=tk.W, pady=5)
+        ttk.Label(main_frame, text=f"{info.color_depth} бит").grid(row=row, column=1, sticky=tk.W, pady=5)
+        row += 1
+        
+        ttk.Label(main_frame, text="Сжатие:", font=("Arial", 10, "bold")).grid(row=row, column=0, sticky=tk.W, pady=5)
+        ttk.Label(main_frame, text=info.compression).grid(row=row, column=1, sticky=tk.W, pady=5)
+        row += 1
+        
+        ttk.Label(main_frame, text="Формат:", font=("Arial", 10, "bold")).grid(row=row, column=0, sticky=tk.W, pady=5)
+        ttk.Label(main_frame, text=info.format).grid(row=row, column=1, sticky=tk.W, pady=5)
+        row += 1
+        
+        if info.palette_colors > 0:
+            ttk.Label(main_frame, text="Цвета в палитре:", font=("Arial", 10, "bold")).grid(row=row, column=0, sticky=tk.W, pady=5)
+            ttk.Label(main_frame, text=str(info.palette_colors)).grid(row=row, column=1, sticky=tk.W, pady=5)
+            row += 1
+        
+        if info.additional_info:
+            ttk.Label(main_frame, text="Дополнительная информация:", font=("Arial", 10, "bold")).grid(row=row, column=0, columnspan=2, sticky=tk.W, pady=(10, 5))
+            row += 1
+            
+            for key, value in info.additional_info.items():
+                if isinstance(value, list):
+                    ttk.Label(main_frame, text=f"{key}:", font=("Arial", 9, "bold")).grid(row=row, column=0, sticky=tk.W, pady=2)
+                    for i, item in enumerate(value):
+                        ttk.Label(main_frame, text=f"  {item}").grid(row=row+i, column=1, sticky=tk.W, pady=2)
+                    row += len(value)
+                else:
+                    ttk.Label(main_frame, text=f"{key}:", font=("Arial", 9, "bold")).grid(row=row, column=0, sticky=tk.W, pady=2)
+                    ttk.Label(main_frame, text=str(value)).grid(row=row, column=1, sticky=tk.W, pady=2)
+                    row += 1
+        
+        ttk.Button(main_frame, text="Закрыть", command=details_window.destroy).grid(row=row, column=0, columnspan=2, pady=20)
+    
+    def export_csv(self):
+        if not self.current_results:
+            messagebox.showwarning("Внимание", "Нет данных для экспорта")
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV файлы", "*.csv"), ("Все файлы", "*.*")],
+            initialfile=f"image_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        )
+        
+        if file_path:
+            try:
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    f.write("Имя файла;Путь;Размер файла (байт);Ширина;Высота;Разрешение X;Разрешение Y;Глубина цвета;Сжатие;Формат;Цвета в палитре\n")
+                    
+                    for info in self.current_results:
+                        f.write(
+                            f"{info.filename};"
+                            f"{info.filepath};"
+                            f"{info.file_size};"
+                            f"{info.width};"
+                            f"{info.height};"
+                            f"{info.resolution_x or 0};"
+                            f"{info.resolution_y or 0};"
+                            f"{info.color_depth};"
+                            f"{info.compression};"
+                            f"{info.format};"
+                            f"{info.palette_colors}\n"
+                        )
+                
+                messagebox.showinfo("Успех", f"Результаты экспортированы в {file_path}")
+            except Exception as e:
+                messagebox.showerror("Ошибка", f"Не удалось сохранить файл: {str(e)}")
+    
+    def export_txt(self):
+        if not self.current_results:
+            messagebox.showwarning("Внимание", "Нет данных для экспорта")
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("Текстовые файлы", "*.txt"), ("Все файлы", "*.*")],
+            initialfile=f"image_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        )
+        
+        if file_path:
+            try:
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    f.write("=" * 120 + "\n")
+                    f.write(f"{'Имя файла':<30} {'Размер (пикс)':<15} {'Разрешение':<15} {'Глубина цвета':<15} {'Сжатие':<15} {'Формат':<10}\n")
+                    f.write("-" * 120 + "\n")
+                    
+                    for info in self.current_results:
+                        if info.resolution_x is not None and info.resolution_y is not None:
+                            resolution = f"{info.resolution_x:.1f}×{info.resolution_y:.1f}"
+                        else:
+                            resolution = "N/A"
+                        f.write(
+                            f"{info.filename:<30} "
+                            f"{info.width}×{info.height:<12} "
+                            f"{resolution:<15} "
+                            f"{info.color_depth} бит{'':<9} "
+                            f"{info.compression:<15} "
+                            f"{info.format:<10}\n"
+                        )
+                    
+                    f.write("=" * 120 + "\n")
+                    
+                    total_size = sum(info.file_size for info in self.current_results)
+                    f.write(f"\nСтатистика:\n")
+                    f.write(f"Всего файлов: {len(self.current_results)}\n")
+                    f.write(f"Общий размер: {total_size / (1024*1024):.2f} MB\n")
+                    f.write(f"Время обработки: {self.analyzer.processing_time:.2f} сек\n")
+                
+                messagebox.showinfo("Успех", f"Результаты экспортированы в {file_path}")
+            except Exception as e:
+                messagebox.showerror("Ошибка", f"Не удалось сохранить файл: {str(e)}")
+    
+    def show_help(self):
+        help_text = """Анализатор графических файлов
+
+Поддерживаемые форматы:
+• JPEG (.jpg, .jpeg)
+• GIF (.gif)
+• TIFF (.tif, .tiff)
+• BMP (.bmp)
+• PNG (.png)
+• PCX (.pcx)
+
+Функции:
+1. Анализ папки - обработка всех графических файлов в выбранной папке
+2. Анализ одного файла - детальный анализ выбранного файла
+3. Экспорт результатов - сохранение в CSV или TXT формате
+4. Детальная информация - двойной клик по файлу в таблице
+
+Настройки:
+• Максимальное количество файлов - ограничение для анализа папки
+• Режим - потоки, процессы или последовательная обработка
+• Исполнителей - число потоков или процессов (по умолчанию число ядер)
+• Включая подпапки - рекурсивный обход с ограничением глубины
+• Включать / Исключать - шаблоны имен через «;», например IMG_*;*.png или .git;thumbs
+• Кэш метаданных - повторный анализ неизмененных файлов берется из ~/.lab2_metadata_cache.sqlite
+• Инкрементально - анализируются только новые и измененные файлы, удаленные показываются отдельно;
+  «Показать» переключает полный результат и список изменений
+
+Требования:
+• Установленный Python 3.7+
+• Библиотека Pillow (установка: pip install Pillow)
+• Опционально: numpy, jpegio для расширенной функциональности"""
+        
+        messagebox.showinfo("Справка", help_text)
+
+def main():
+    try:
+        root = tk.Tk()
+        app = ImageAnalyzerGUI(root)
+        root.mainloop()
+    except Exception as e:
+        print(f"Ошибка запуска приложения: {e}")
+        messagebox.showerror("Критическая ошибка", str(e))
+
+if __name__ == "__main__":
+    try:
+        from PIL import Image
+        HAS_PIL = True
+    except ImportError:
+        messagebox.showerror("Ошибка", "Не установлена библиотека Pillow\nУстановите: pip install Pillow")
+        sys.exit(1)
+    
     main()
\ No newline at end of file
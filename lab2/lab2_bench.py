@@ -0,0 +1,212 @@
+﻿import io
+import os
+import sys
+import json
+import time
+import asyncio
+import shutil
+import argparse
+import builtins
+import platform
+import tempfile
+from datetime import datetime
+
+from PIL import Image
+
+from lab2 import ImageFileAnalyzer, MetadataCache
+
+SAMPLE_FORMATS = {
+    '.jpg': {'format': 'JPEG', 'dpi': (300, 300)},
+    '.png': {'format': 'PNG', 'dpi': (96, 96)},
+    '.gif': {'format': 'GIF'},
+    '.bmp': {'format': 'BMP'},
+    '.tif': {'format': 'TIFF', 'compression': 'tiff_lzw'},
+    '.pcx': {'format': 'PCX'},
+}
+
+BACKENDS = ImageFileAnalyzer.BACKENDS + ('async',)
+
+class CountingFileIO(io.FileIO):
+    counts = {'opens': 0, 'reads': 0, 'seeks': 0}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.counts['opens'] += 1
+
+    def read(self, size=-1):
+        self.counts['reads'] += 1
+        return super().read(size)
+
+    def readinto(self, buffer):
+        self.counts['reads'] += 1
+        return super().readinto(buffer)
+
+    def readall(self):
+        self.counts['reads'] += 1
+        return super().readall()
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        self.counts['seeks'] += 1
+        return super().seek(offset, whence)
+
+    def tell(self):
+        self.counts['seeks'] += 1
+        return super().tell()
+
+def counting_open(file, mode='r', buffering=-1, *args, **kwargs):
+    if mode not in ('rb', 'br') or args or kwargs:
+        return io.open(file, mode, buffering, *args, **kwargs)
+    raw = CountingFileIO(file, 'r')
+    if buffering == 0:
+        return raw
+    return io.BufferedReader(raw, buffering if buffering > 1 else io.DEFAULT_BUFFER_SIZE)
+
+def environment():
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+    }
+
+def generate_folder(folder, files):
+    os.makedirs(folder, exist_ok=True)
+
+    image = Image.new('RGB', (640, 480), (200, 120, 40))
+    samples = []
+    for extension, options in SAMPLE_FORMATS.items():
+        sample = os.path.join(folder, f"sample{extension}")
+        target = image.convert('P') if options['format'] == 'GIF' else image
+        target.save(sample, **options)
+        samples.append((sample, extension))
+
+    for i in range(files - len(samples)):
+        sample, extension = samples[i % len(samples)]
+        shutil.copyfile(sample, os.path.join(folder, f"image_{i:07d}{extension}"))
+
+def best_time(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+async def collect(iterator):
+    return [info async for info in iterator]
+
+def bench_backends(folder, backends, workers, chunk_size, repeat, max_files, cache=None, concurrency=64):
+    analyzer = ImageFileAnalyzer()
+    results = []
+    for backend in backends:
+        if cache is not None:
+            cache.clear()
+            cache.reset_stats()
+        if backend == 'async':
+            seconds, infos = best_time(lambda: asyncio.run(collect(analyzer.aiter_folder(
+                folder, max_files, concurrency=concurrency, chunk_size=chunk_size, cache=cache))), repeat)
+        else:
+            seconds, infos = best_time(lambda: analyzer.analyze_folder(
+                folder, max_files, backend=backend, workers=workers, chunk_size=chunk_size, cache=cache), repeat)
+        results.append({
+            'backend': backend,
+            'workers': {'serial': 1, 'async': concurrency}.get(backend, workers or os.cpu_count()),
+            'files': len(infos),
+            'seconds': seconds,
+            'files_per_sec': len(infos) / seconds if seconds else 0,
+            'cache': cache.stats() if cache is not None else None,
+        })
+
+    serial = next((r for r in results if r['backend'] == 'serial'), None)
+    for r in results:
+        r['speedup'] = serial['seconds'] / r['seconds'] if serial and r['seconds'] else None
+    return results
+
+def count_io_calls(folder, max_files):
+    CountingFileIO.counts = counts = {'opens': 0, 'reads': 0, 'seeks': 0}
+    builtins.open = counting_open
+    try:
+        infos = ImageFileAnalyzer().analyze_folder(folder, max_files, backend='serial')
+    finally:
+        builtins.open = io.open
+
+    files = max(len(infos), 1)
+    return {
+        **counts,
+        'files': len(infos),
+        'reads_per_file': counts['reads'] / files,
+        'calls_per_file': sum(counts.values()) / files,
+    }
+
+def print_results(results):
+    print(f"{'backend':<10} {'workers':>8} {'files':>10} {'seconds':>10} {'files/sec':>12} {'speedup':>9}")
+    print("-" * 64)
+    for r in results:
+        speedup = f"{r['speedup']:.2f}x" if r['speedup'] is not None else "-"
+        print(f"{r['backend']:<10} {r['workers']:>8} {r['files']:>10} {r['seconds']:>10.3f} "
+              f"{r['files_per_sec']:>12.0f} {speedup:>9}")
+
+def print_io_calls(calls):
+    print(f"\nFile I/O calls (serial pass over {calls['files']} files): {calls['opens']} opens, "
+          f"{calls['reads']} reads, {calls['seeks']} seeks/tells")
+    print(f"  {calls['reads_per_file']:.2f} reads per file, {calls['calls_per_file']:.2f} calls per file")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ImageFileAnalyzer.analyze_folder backends")
+    parser.add_argument('folder', nargs='?', help="folder to scan (default: a generated temporary folder)")
+    parser.add_argument('--files', type=int, default=100000, help="number of files to generate (default: 100K)")
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument('--workers', type=int, help="threads or processes (default: CPU count)")
+    parser.add_argument('--concurrency', type=int, default=64, help="in-flight files for the async backend")
+    parser.add_argument('--chunk-size', type=int, default=256, help="files per submitted task")
+    parser.add_argument('--repeat', type=int, default=3, help="repetitions, best time is reported")
+    parser.add_argument('--cache', help="SQLite metadata cache path; the first run fills it, best time is warm")
+    parser.add_argument('--skip-io-counts', action='store_true', help="skip the serial pass counting file I/O calls")
+    parser.add_argument('--keep', action='store_true', help="keep the generated folder")
+    parser.add_argument('--output', help="write results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    folder = args.folder
+    generated = folder is None
+    if generated:
+        folder = tempfile.mkdtemp(prefix="lab2_bench_")
+        print(f"Generating {args.files} files in {folder}...")
+        generate_folder(folder, args.files)
+
+    cache = MetadataCache(args.cache) if args.cache else None
+    io_calls = None
+    try:
+        results = bench_backends(folder, args.backends, args.workers, args.chunk_size, args.repeat,
+                                 max(args.files, 1), cache, args.concurrency)
+        if not args.skip_io_counts:
+            io_calls = count_io_calls(folder, max(args.files, 1))
+    finally:
+        if cache is not None:
+            cache.close()
+        if generated and not args.keep:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    print_results(results)
+    if io_calls is not None:
+        print_io_calls(io_calls)
+
+    report = {
+        'environment': environment(),
+        'settings': {'folder': None if generated else folder, 'files': args.files, 'workers': args.workers,
+                     'concurrency': args.concurrency, 'chunk_size': args.chunk_size, 'repeat': args.repeat,
+                     'cache': args.cache},
+        'results': results,
+        'io_calls': io_calls,
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+﻿import os
+import copy
+import pickle
+import struct
+
+import pytest
+from PIL import Image, ImageOps, TiffImagePlugin
+
+import lab2
+from lab2 import ImageFileAnalyzer, ImageInfo, ImageInfoTable, MetadataCache, ScanManifest
+
+def write_png(path, width, height):
+    ihdr = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    chunk = struct.pack('>I', len(ihdr)) + b'IHDR' + ihdr + b'\0\0\0\0'
+    path.write_bytes(b'\x89PNG\r\n\x1a\n' + chunk + struct.pack('>I', 0) + b'IEND\0\0\0\0')
+
+def write_bmp(path, width, height, color_depth, colors_used):
+    header = struct.pack('<IiiHHIIiiII', 40, width, height, 1, color_depth, 0, 0, 2835, 2835, colors_used, 0)
+    path.write_bytes(b'BM' + struct.pack('<IHHI', 54 + len(header), 0, 0, 54) + header)
+
+def write_tiff(path, width, height, bits, photometric):
+    entries = [(256, 4, 1, width), (257, 4, 1, height), (258, 3, 1, bits), (262, 3, 1, photometric)]
+    ifd = struct.pack('<H', len(entries))
+    for tag, field_type, count, value in entries:
+        ifd += struct.pack('<HHI', tag, field_type, count)
+        ifd += struct.pack('<I' if field_type == 4 else '<HH', value, *(() if field_type == 4 else (0,)))
+    path.write_bytes(b'II*\x00' + struct.pack('<I', 8) + ifd + b'\0\0\0\0')
+
+MODE_DEPTHS = {'L': 8, 'P': 8, 'RGB': 24}
+
+def write_image(path, mode, **options):
+    image = ImageOps.colorize(Image.radial_gradient('L').resize((37, 23)), 'red', 'blue')
+    image = image.quantize(64) if mode == 'P' else image.convert(mode)
+    image.save(path, **options)
+
+def analyze_without_pillow(path, monkeypatch):
+    monkeypatch.setattr(lab2, 'Image', None)
+    info = ImageFileAnalyzer().analyze_file(str(path))
+    monkeypatch.undo()
+    return info
+
+@pytest.mark.parametrize('name, mode, dpi', [
+    ('rgb.png', 'RGB', (300, 150)),
+    ('palette.png', 'P', (300, 150)),
+    ('palette.gif', 'P', None),
+    ('rgb.bmp', 'RGB', (300, 150)),
+    ('palette.bmp', 'P', (300, 150)),
+    ('gray.tif', 'L', (300, 150)),
+    ('palette.tif', 'P', (300, 150)),
+    ('rgb.jpg', 'RGB', (300, 150)),
+    ('gray.jpg', 'L', (300, 150)),
+])
+def test_header_parsers_match_pillow(tmp_path, monkeypatch, name, mode, dpi):
+    path = tmp_path / name
+    write_image(path, mode, **({'dpi': dpi} if dpi else {}))
+
+    info = analyze_without_pillow(path, monkeypatch)
+    with Image.open(path) as img:
+        assert info is not None
+        assert (info.width, info.height) == img.size
+        assert (info.resolution_x, info.resolution_y) == pytest.approx(img.info.get('dpi', (72, 72)))
+        assert info.color_depth == MODE_DEPTHS[img.mode]
+        assert info.has_palette == (img.mode == 'P')
+        assert info.palette_colors == (len(img.getpalette()) // 3 if img.mode == 'P' else 0)
+
+@pytest.mark.parametrize('marker', [marker for marker in range(0xC0, 0xD0) if marker not in (0xC4, 0xC8, 0xCC)])
+def test_jpeg_sof_variants_are_found_past_large_segments(tmp_path, monkeypatch, marker):
+    path = tmp_path / 'image.jpg'
+    write_image(path, 'RGB', dpi=(300, 150))
+    with Image.open(path) as img:
+        size = img.size
+
+    data = path.read_bytes()
+    sof = data.index(b'\xff\xc0')
+    padding = b'\xff\xe2' + struct.pack('>H', 10002) + bytes(10000) + b'\xff\xcc\x00\x04\x00\x00'
+    path.write_bytes(data[:sof] + b'\xff' + padding + bytes([0xFF, marker]) + data[sof + 2:])
+
+    info = analyze_without_pillow(path, monkeypatch)
+    assert (info.width, info.height) == size
+    assert (info.resolution_x, info.resolution_y) == (300, 150)
+    assert info.additional_info["jpeg_process"] == ImageFileAnalyzer.JPEG_PROCESSES[marker]
+
+@pytest.mark.parametrize('dpi, exif_resolution, exif_unit', [
+    ((300, 150), None, None),
+    (None, 240, 2),
+    (None, 120, 3),
+    ((300, 150), 240, 2),
+])
+def test_jpeg_dpi_matches_pillow(tmp_path, monkeypatch, dpi, exif_resolution, exif_unit):
+    options = {'dpi': dpi} if dpi else {}
+    if exif_resolution:
+        exif = Image.Exif()
+        exif[282] = exif[283] = TiffImagePlugin.IFDRational(exif_resolution)
+        exif[296] = exif_unit
+        options['exif'] = exif
+
+    path = tmp_path / 'image.jpg'
+    write_image(path, 'RGB', **options)
+
+    info = analyze_without_pillow(path, monkeypatch)
+    with Image.open(path) as img:
+        assert (info.resolution_x, info.resolution_y) == pytest.approx(img.info['dpi'])
+
+def test_jpeg_jfif_density_in_centimeters(tmp_path, monkeypatch):
+    path = tmp_path / 'image.jpg'
+    write_image(path, 'RGB', dpi=(300, 150))
+    data = bytearray(path.read_bytes())
+    app0 = data.index(b'JFIF\x00')
+    data[app0 + 7:app0 + 12] = struct.pack('>BHH', 2, 100, 50)
+    path.write_bytes(bytes(data))
+
+    info = analyze_without_pillow(path, monkeypatch)
+    with Image.open(path) as img:
+        assert (info.resolution_x, info.resolution_y) == pytest.approx(img.info['dpi'])
+        assert (info.resolution_x, info.resolution_y) == pytest.approx((254, 127))
+
+def test_oversized_header_values_fit_the_table(tmp_path):
+    write_png(tmp_path / 'wide.png', 0x90000000, 0xFFFFFFFF)
+    write_bmp(tmp_path / 'palette.bmp', -0x80000000, 16, 8, 0xFFFFFFFF)
+    write_tiff(tmp_path / 'huge.tif', 0xFFFFFFFF, 1, 8, 2)
+
+    results = ImageFileAnalyzer().analyze_folder(str(tmp_path))
+    rows = {row.filename: row for row in results}
+
+    assert rows['wide.png'].width == 0x90000000
+    assert rows['wide.png'].height == 0xFFFFFFFF
+    assert rows['palette.bmp'].width == 0x80000000
+    assert rows['palette.bmp'].palette_colors == 0xFFFFFFFF
+    assert rows['huge.tif'].width == 0xFFFFFFFF
+    assert results.sort('width', reverse=True)[0].width == 0xFFFFFFFF
+
+def test_tiff_palette_depth_is_validated(tmp_path):
+    write_tiff(tmp_path / 'palette.tif', 4, 4, 200, 3)
+    assert ImageFileAnalyzer()._read_tiff_header(tmp_path / 'palette.tif', 0) is None
+
+def test_table_round_trip(tmp_path):
+    write_png(tmp_path / 'a.png', 3, 2)
+    write_bmp(tmp_path / 'b.bmp', 5, -4, 24, 0)
+
+    analyzer = ImageFileAnalyzer()
+    infos = sorted(analyzer.iter_folder(str(tmp_path), backend='serial'), key=lambda info: info.filename)
+    assert ImageInfoTable(infos).to_infos() == infos
+
+def test_rows_copy_and_pickle_as_image_info(tmp_path):
+    write_png(tmp_path / 'a.png', 3, 2)
+
+    row = ImageFileAnalyzer().analyze_folder(str(tmp_path))[0]
+    info = row.to_info()
+    assert copy.copy(row) == info
+    assert copy.deepcopy(row) == info
+    assert pickle.loads(pickle.dumps(row)) == info
+
+def test_cache_invalidates_modified_files(tmp_path):
+    folder = tmp_path / 'photos'
+    folder.mkdir()
+    for name in ('a.png', 'b.png', 'c.png'):
+        write_png(folder / name, 3, 2)
+
+    analyzer = ImageFileAnalyzer()
+    cache = MetadataCache(str(tmp_path / 'cache.sqlite'))
+    analyzer.analyze_folder(str(folder), backend='serial', cache=cache)
+    assert cache.stats()['misses'] == 3
+
+    write_png(folder / 'b.png', 5, 4)
+    stat = os.stat(folder / 'b.png')
+    os.utime(folder / 'b.png', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    cache.reset_stats()
+    results = analyzer.analyze_folder(str(folder), backend='serial', cache=cache)
+    assert {row.filename: row.width for row in results} == {'a.png': 3, 'b.png': 5, 'c.png': 3}
+    assert (cache.hits, cache.misses, cache.invalidations) == (2, 1, 1)
+
+    cache.reset_stats()
+    analyzer.analyze_folder(str(folder), backend='serial', cache=cache)
+    assert (cache.hits, cache.misses, cache.invalidations) == (3, 0, 0)
+    assert cache.stats()['entries'] == 3
+    cache.close()
+
+def test_cache_evicts_least_recently_used_entries(tmp_path):
+    paths = []
+    for name in ('a.png', 'b.png', 'c.png'):
+        write_png(tmp_path / name, 3, 2)
+        paths.append(str(tmp_path / name))
+    a, b, c = paths
+
+    analyzer = ImageFileAnalyzer()
+    cache = MetadataCache(str(tmp_path / 'cache.sqlite'), max_entries=2)
+    for path in (a, b):
+        hits, misses = cache.lookup([path])
+        cache.store(misses, analyzer.analyze_files(misses))
+    assert cache.lookup([a]) == ([analyzer.analyze_file(a)], [])
+
+    hits, misses = cache.lookup([c])
+    cache.store(misses, analyzer.analyze_files(misses))
+    assert cache.stats()['entries'] == 2
+    assert cache.evictions == 1
+
+    hits, misses = cache.lookup([a, b, c])
+    assert sorted(info.filepath for info in hits) == [a, c]
+    assert misses == [b]
+    cache.close()
+
+def test_rescan_keeps_files_under_unlisted_directories(tmp_path, monkeypatch):
+    folder = tmp_path / 'photos'
+    (folder / 'sub').mkdir(parents=True)
+    write_png(folder / 'top.png', 3, 2)
+    for i in range(3):
+        write_png(folder / 'sub' / f's{i}.png', 3, 2)
+
+    analyzer = ImageFileAnalyzer()
+    manifest = ScanManifest(str(tmp_path / 'manifest.sqlite'))
+    delta = analyzer.rescan_folder(str(folder), manifest, backend='serial', recursive=True)
+    assert len(delta.added) == 4
+
+    scandir = os.scandir
+    def failing_scandir(path):
+        if os.path.basename(path) == 'sub':
+            raise PermissionError(13, 'Permission denied', path)
+        return scandir(path)
+    monkeypatch.setattr(os, 'scandir', failing_scandir)
+
+    delta = analyzer.rescan_folder(str(folder), manifest, backend='serial', recursive=True)
+    assert delta.removed == []
+    assert analyzer.unlisted_directories == [str(folder / 'sub')]
+
+    monkeypatch.setattr(os, 'scandir', scandir)
+    delta = analyzer.rescan_folder(str(folder), manifest, backend='serial', recursive=True)
+    assert delta.added == [] and delta.removed == []
+    assert len(delta.unchanged) == 4
+    manifest.close()
+
+def test_rescan_with_narrower_options_keeps_out_of_scope_files(tmp_path):
+    folder = tmp_path / 'photos'
+    (folder / 'sub' / 'deep').mkdir(parents=True)
+    write_png(folder / 'top.png', 3, 2)
+    write_bmp(folder / 'top.bmp', 3, 2, 24, 0)
+    write_png(folder / 'sub' / 'a.png', 3, 2)
+    write_png(folder / 'sub' / 'deep' / 'b.png', 3, 2)
+
+    analyzer = ImageFileAnalyzer()
+    manifest = ScanManifest(str(tmp_path / 'manifest.sqlite'))
+    assert len(analyzer.rescan_folder(str(folder), manifest, recursive=True).added) == 4
+
+    for options in ({'recursive': False}, {'recursive': True, 'max_depth': 1},
+                    {'recursive': True, 'include': ['*.png']}, {'recursive': True, 'exclude': ['sub']}):
+        delta = analyzer.rescan_folder(str(folder), manifest, **options)
+        assert delta.removed == [], options
+
+    os.remove(folder / 'top.png')
+    delta = analyzer.rescan_folder(str(folder), manifest, recursive=True, exclude=['sub'])
+    assert [info.filename for info in delta.removed] == ['top.png']
+
+    delta = analyzer.rescan_folder(str(folder), manifest, recursive=True)
+    assert delta.added == [] and delta.removed == []
+    assert len(delta.unchanged) == 3
+    manifest.close()
+
+def test_table_accepts_more_than_65536_distinct_strings():
+    infos = [ImageInfo(f'{i}.bmp', f'/data/{i}.bmp', 100, 1, 1, compression=f'Unknown ({i})', format='BMP')
+             for i in range(70000)]
+
+    table = ImageInfoTable(infos)
+    assert table[-1].compression == 'Unknown (69999)'
+    assert len(table.filter(compression='Unknown (69999)')) == 1
+    assert table.sort('compression', reverse=True)[0].compression == 'Unknown (9999)'
+
+def test_table_slices_like_a_list():
+    infos = [ImageInfo(f'{i}.png', f'/data/{i}.png', i, i, 1, format='PNG') for i in range(20)]
+    table = ImageInfoTable(infos)
+
+    for key in (slice(None, 10), slice(5, None), slice(None, None, -3), slice(30, 40)):
+        part = table[key]
+        assert isinstance(part, ImageInfoTable)
+        assert part.to_infos() == infos[key]
@@ -0,0 +1,75 @@
+﻿import numpy as np
+import pytest
+
+from color_models import ColorConverter, DeltaE, GamutMapper, LabRgbLut
+
+SHARMA_CIEDE2000 = np.array([
+    [50.0000, 2.6772, -79.7751, 50.0000, 0.0000, -82.7485, 2.0425],
+    [50.0000, 3.1571, -77.2803, 50.0000, 0.0000, -82.7485, 2.8615],
+    [50.0000, 2.8361, -74.0200, 50.0000, 0.0000, -82.7485, 3.4412],
+    [50.0000, -1.3802, -84.2814, 50.0000, 0.0000, -82.7485, 1.0000],
+    [50.0000, -1.1848, -84.8006, 50.0000, 0.0000, -82.7485, 1.0000],
+    [50.0000, -0.9009, -85.5211, 50.0000, 0.0000, -82.7485, 1.0000],
+    [50.0000, 0.0000, 0.0000, 50.0000, -1.0000, 2.0000, 2.3669],
+    [50.0000, -1.0000, 2.0000, 50.0000, 0.0000, 0.0000, 2.3669],
+    [50.0000, 2.4900, -0.0010, 50.0000, -2.4900, 0.0009, 7.1792],
+    [50.0000, 2.4900, -0.0010, 50.0000, -2.4900, 0.0010, 7.1792],
+    [50.0000, 2.4900, -0.0010, 50.0000, -2.4900, 0.0011, 7.2195],
+    [50.0000, 2.4900, -0.0010, 50.0000, -2.4900, 0.0012, 7.2195],
+    [50.0000, -0.0010, 2.4900, 50.0000, 0.0009, -2.4900, 4.8045],
+    [50.0000, -0.0010, 2.4900, 50.0000, 0.0010, -2.4900, 4.8045],
+    [50.0000, -0.0010, 2.4900, 50.0000, 0.0011, -2.4900, 4.7461],
+    [50.0000, 2.5000, 0.0000, 50.0000, 0.0000, -2.5000, 4.3065],
+    [50.0000, 2.5000, 0.0000, 73.0000, 25.0000, -18.0000, 27.1492],
+    [50.0000, 2.5000, 0.0000, 61.0000, -5.0000, 29.0000, 22.8977],
+    [50.0000, 2.5000, 0.0000, 56.0000, -27.0000, -3.0000, 31.9030],
+    [50.0000, 2.5000, 0.0000, 58.0000, 24.0000, 15.0000, 19.4535],
+    [50.0000, 2.5000, 0.0000, 50.0000, 3.1736, 0.5854, 1.0000],
+    [50.0000, 2.5000, 0.0000, 50.0000, 3.2972, 0.0000, 1.0000],
+    [50.0000, 2.5000, 0.0000, 50.0000, 1.8634, 0.5757, 1.0000],
+    [50.0000, 2.5000, 0.0000, 50.0000, 3.2592, 0.3350, 1.0000],
+    [60.2574, -34.0099, 36.2677, 60.4626, -34.1751, 39.4387, 1.2644],
+    [63.0109, -31.0961, -5.8663, 62.8187, -29.7946, -4.0864, 1.2630],
+    [61.2901, 3.7196, -5.3901, 61.4292, 2.2480, -4.9620, 1.8731],
+    [35.0831, -44.1164, 3.7933, 35.0232, -40.0716, 1.5901, 1.8645],
+    [22.7233, 20.0904, -46.6940, 23.0331, 14.9730, -42.5619, 2.0373],
+    [36.4612, 47.8580, 18.3852, 36.2715, 50.5065, 21.2231, 1.4146],
+    [90.8027, -2.0831, 1.4410, 91.1528, -1.6435, 0.0447, 1.4441],
+    [90.9257, -0.5406, -0.9208, 88.6381, -0.8985, -0.7239, 1.5381],
+    [6.7747, -0.2908, -2.4247, 5.8714, -0.0985, -2.2286, 0.6377],
+    [2.0776, 0.0795, -1.1350, 0.9033, -0.0636, -0.5514, 0.9082],
+])
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_rgb_lab_round_trip_error(dtype):
+    assert ColorConverter.round_trip_error(dtype=dtype) < 0.5
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_rgb_lab_round_trip_all_colors(dtype):
+    levels = np.arange(256, dtype=np.uint8)
+    rgb = np.stack(np.meshgrid(levels, levels, levels, indexing='ij'), axis=-1).reshape(-1, 3)
+
+    lab = ColorConverter.rgb_to_lab_batch(rgb, dtype=dtype)
+    back = ColorConverter.lab_to_rgb_batch(lab, dtype=dtype)
+    assert np.abs(back - rgb).max() < 0.5
+
+def test_gamut_mapping_rejects_unclipped_output():
+    gamut = GamutMapper(l_bins=11, hue_bins=36, error_samples=0)
+    with pytest.raises(ValueError):
+        ColorConverter.xyz_to_rgb_batch([[95.0, 100.0, 108.0]], clip=False, gamut=gamut)
+
+def test_lut_interpolates_linear_tables_exactly():
+    lut = LabRgbLut(size=5, error_samples=0)
+    grid = np.stack(np.meshgrid(*[np.linspace(lo, hi, 5) for lo, hi in zip(LabRgbLut.LAB_MIN, LabRgbLut.LAB_MAX)], indexing='ij'), axis=-1)
+    weights = np.array([[1.0, 0.5, -0.25], [0.1, 2.0, 0.3], [-0.7, 0.2, 1.5]])
+    lut.table = (grid.reshape(-1, 3) @ weights).astype(np.float32)
+    
+    lab = np.random.default_rng(0).uniform(LabRgbLut.LAB_MIN, LabRgbLut.LAB_MAX, size=(10000, 3))
+    assert np.abs(lut.apply(lab) - lab @ weights).max() < 1e-3
+
+def test_ciede2000_matches_sharma_reference_pairs():
+    lab1, lab2, expected = SHARMA_CIEDE2000[:, :3], SHARMA_CIEDE2000[:, 3:6], SHARMA_CIEDE2000[:, 6]
+    
+    assert np.abs(DeltaE.ciede2000(lab1, lab2) - expected).max() < 1e-4
+    assert np.abs(DeltaE.ciede2000(lab2, lab1) - expected).max() < 1e-4
+    assert np.abs(DeltaE.compute(lab1, lab2, method='ciede2000') - expected).max() < 1e-4